@@ -1,6 +1,14 @@
 from .states import is_absorbing, absorbing_states, outgoing_mass
 
-from .reachability import reachable, communicates, communication_classes, is_closed
+from .reachability import (
+    reachable,
+    reachable_reverse,
+    reachability_matrix,
+    communicates,
+    communication_classes,
+    communication_class_of,
+    is_closed,
+)
 
 from .simulation import next_state, simulate, simulate_until
 
@@ -11,8 +19,11 @@ __all__ = [
     "absorbing_states",
     "outgoing_mass",
     "reachable",
+    "reachable_reverse",
+    "reachability_matrix",
     "communicates",
     "communication_classes",
+    "communication_class_of",
     "is_closed",
     "next_state",
     "simulate",
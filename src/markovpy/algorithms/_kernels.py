@@ -0,0 +1,347 @@
+import numpy as np
+
+# Frontiers up to this size are expanded one state at a time in Python, whole
+# array operations only pay off once a level holds enough states.
+_SCALAR_FRONTIER = 64
+
+# Chains up to this many states use packed bitset reachability, beyond it the
+# n x n/64 bit matrices cost more than one CSR search per source.
+_BITSET_MAX_STATES = 4096
+
+
+def _search_scalar(
+    ptr: list, indices: np.ndarray, seen: bytearray, stack: list
+) -> list:
+    """
+    Depth first search from the states on stack, marking seen in place.
+
+    Stops early once the stack outgrows _SCALAR_FRONTIER, so wide searches can
+    hand the remaining frontier to a vectorised kernel.
+    :param ptr: CSR row pointers as a list
+    :param indices: CSR column indices
+    :param seen: Visited flag of every state, stack states must already be set
+    :param stack: States still to expand
+    :return: Remaining stack, empty once the search is complete
+    """
+    while stack and len(stack) <= _SCALAR_FRONTIER:
+        u = stack.pop()
+        for v in indices[ptr[u] : ptr[u + 1]].tolist():
+            if not seen[v]:
+                seen[v] = 1
+                stack.append(v)
+    return stack
+
+
+def reachable_csr(indptr: np.ndarray, indices: np.ndarray, source: int) -> np.ndarray:
+    """
+    Breadth first search over a CSR transition graph, see Chain.to_csr.
+
+    Wide levels of the search are expanded with whole-array operations, so the
+    Python loop runs once per level rather than once per state. Narrow stretches,
+    such as long cycles, fall back to a scalar search.
+    :param indptr: CSR row pointers
+    :param indices: CSR column indices
+    :param source: Index of the source state
+    :return: uint8 mask of states reachable from source
+    """
+    seen = bytearray(len(indptr) - 1)
+    visited = np.frombuffer(seen, dtype=np.uint8)
+    seen[source] = 1
+    ptr = indptr.tolist()
+    frontier = [source]
+
+    while len(frontier):
+        if len(frontier) <= _SCALAR_FRONTIER:
+            frontier = _search_scalar(ptr, indices, seen, list(frontier))
+            continue
+
+        frontier = np.asarray(frontier)
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            break
+
+        # Positions in indices of every successor of the frontier
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        nbrs = indices[offsets + np.arange(total)]
+
+        frontier = np.unique(nbrs[visited[nbrs] == 0])
+        visited[frontier] = 1
+        if len(frontier) <= _SCALAR_FRONTIER:
+            frontier = frontier.tolist()
+
+    return visited
+
+
+def pack_rows(mask: np.ndarray) -> np.ndarray:
+    """
+    Packs each row of a boolean matrix into uint64 words, bit j of the row is
+    bit j % 64 of word j // 64.
+    :param mask: n x m boolean matrix
+    :return: n x ceil(m / 64) uint64 matrix
+    """
+    n, m = mask.shape
+    packed = np.zeros((n, -(-m // 64) * 8), dtype=np.uint8)
+    packed[:, : -(-m // 8)] = np.packbits(mask, axis=1, bitorder="little")
+    return packed.view(np.uint64)
+
+
+def unpack_rows(bits: np.ndarray, m: int) -> np.ndarray:
+    """
+    Inverse of pack_rows.
+    :param bits: n x words uint64 matrix
+    :param m: Number of columns to unpack
+    :return: n x m boolean matrix
+    """
+    return np.unpackbits(
+        bits.view(np.uint8), axis=1, count=m, bitorder="little"
+    ).astype(bool)
+
+
+def successor_bitsets(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Packs the successors of every state into uint64 bitsets, see pack_rows.
+    :param indptr: CSR row pointers
+    :param indices: CSR column indices
+    :return: n x ceil(n / 64) uint64 matrix, bit j of row i set if i -> j
+    """
+    n = len(indptr) - 1
+    bits = np.zeros((n, -(-n // 64)), dtype=np.uint64)
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    cols = indices.astype(np.uint64)
+    words = (cols >> np.uint64(6)).astype(np.intp)
+    np.bitwise_or.at(bits, (rows, words), np.uint64(1) << (cols & np.uint64(63)))
+    return bits
+
+
+def reach_bitset(
+    bits: np.ndarray, source: int, indptr: np.ndarray, indices: np.ndarray
+) -> np.ndarray:
+    """
+    Breadth first search over packed successor bitsets, see successor_bitsets.
+
+    Wide levels OR together the rows of the frontier, so one word operation
+    covers 64 candidate states. Narrow stretches fall back to a scalar search
+    over the CSR arrays the bitsets were built from.
+    :param bits: n x words uint64 successor bitsets
+    :param source: Index of the source state
+    :param indptr: CSR row pointers
+    :param indices: CSR column indices
+    :return: Packed uint64 bitset of states reachable from source
+    """
+    n = len(bits)
+    seen = bytearray(n)
+    seen[source] = 1
+    ptr = indptr.tolist()
+    stack = [source]
+
+    while True:
+        stack = _search_scalar(ptr, indices, seen, stack)
+        visited = pack_rows(np.frombuffer(seen, dtype=bool)[None])[0]
+        if not stack:
+            return visited
+
+        members = np.array(stack)
+        while members.size > _SCALAR_FRONTIER:
+            frontier = np.bitwise_or.reduce(bits[members], axis=0) & ~visited
+            visited |= frontier
+            members = np.flatnonzero(unpack_rows(frontier[None], n)[0])
+
+        if not members.size:
+            return visited
+        seen = bytearray(unpack_rows(visited[None], n)[0].tobytes())
+        stack = members.tolist()
+
+
+def closure_bitset(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Reachability closure by repeated squaring of the packed adjacency matrix.
+
+    Rows are uint64 bitsets, so each OR combines 64 states. Squaring doubles the
+    path length covered, so at most ceil(log2(n)) + 1 rounds are needed.
+    :param indptr: CSR row pointers
+    :param indices: CSR column indices
+    :return: n x n boolean matrix, entry [s, t] is True if t is reachable from s
+    """
+    n = len(indptr) - 1
+
+    adj = np.eye(n, dtype=bool)
+    adj[np.repeat(np.arange(n), np.diff(indptr)), indices] = True
+    reach = pack_rows(adj)
+
+    while True:
+        dense = unpack_rows(reach, n)
+        # Row i becomes the union of the rows of every state row i reaches
+        squared = np.empty_like(reach)
+        for i in range(n):
+            squared[i] = np.bitwise_or.reduce(reach[dense[i]], axis=0)
+
+        if np.array_equal(squared, reach):
+            return dense
+        reach = squared
+
+
+def power_iteration_csr(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    probs: np.ndarray,
+    tol: float,
+    max_iter: int,
+    absorbing: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Power iteration pi <- pi P over a row-normalised CSR transition matrix.
+
+    Work buffers are allocated once, each step gathers pi along the rows,
+    scatters it into the columns with bincount and measures the L1 change.
+    :param indptr: CSR row pointers
+    :param indices: CSR column indices
+    :param probs: Row-normalised CSR probabilities
+    :param tol: L1 tolerance between successive iterates
+    :param max_iter: Maximum number of iterations
+    :param absorbing: Optional indices of states that keep their mass, as if
+        they had a self-loop of probability 1
+    :return: Final iterate, not renormalised
+    """
+    n = len(indptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+
+    pi = np.full(n, 1.0 / max(n, 1))
+    flow = np.empty(len(indices))
+    diff = np.empty(n)
+
+    for _ in range(max_iter):
+        # (π P)_j = sum_i π_i P[i, j]
+        np.take(pi, rows, out=flow)
+        np.multiply(flow, probs, out=flow)
+        # bincount returns integers when there are no weights at all
+        pi_next = np.bincount(indices, weights=flow, minlength=n).astype(
+            np.float64, copy=False
+        )
+        if absorbing is not None:
+            pi_next[absorbing] += pi[absorbing]
+
+        np.subtract(pi_next, pi, out=diff)
+        pi = pi_next
+        if np.abs(diff, out=diff).sum() < tol:
+            break
+
+    return pi
+
+
+def power_iteration_dense(P: np.ndarray, tol: float, max_iter: int) -> np.ndarray:
+    """
+    Power iteration pi <- pi P over a dense row-normalised transition matrix.
+
+    The iterate and its successor swap between two preallocated buffers, so each
+    step is one BLAS matrix-vector product with no allocation. Chains that have
+    not converged after n steps, the cost of one matrix product, are slow mixing,
+    from then on the step matrix is squared each iteration so the number of
+    steps covered doubles. A converged jump is confirmed with plain steps, as a
+    jump over a whole period of a periodic chain would also look stationary.
+    Only P and the current step matrix are kept. When the next jump would pass
+    max_iter the largest power of two that still fits is rebuilt from P by
+    squaring, so exactly max_iter steps are taken at most.
+    :param P: Row-normalised n x n transition matrix
+    :param tol: L1 tolerance between successive iterates
+    :param max_iter: Maximum number of steps
+    :return: Final iterate, not renormalised
+    """
+    n = len(P)
+
+    pi = np.full(n, 1.0 / max(n, 1))
+    pi_next = np.empty(n)
+    diff = np.empty(n)
+
+    step = P  # P ** span
+    span = 1
+    squaring = True
+    steps = 0
+
+    while steps < max_iter:
+        # Never step past max_iter, rebuild the largest power that still fits
+        if span > max_iter - steps:
+            step, span, squaring = P, 1, False
+            while 2 * span <= max_iter - steps:
+                step = step @ step
+                span *= 2
+
+        np.dot(pi, step, out=pi_next)
+        steps += span
+
+        np.subtract(pi_next, pi, out=diff)
+        pi, pi_next = pi_next, pi
+        if np.abs(diff, out=diff).sum() < tol:
+            if span == 1:
+                break
+            step, span, squaring = P, 1, False
+        elif squaring and steps >= n and 2 * span <= max_iter - steps:
+            step = step @ step
+            span *= 2
+
+    return pi
+
+
+def hitting_times_csr(
+    indptr: np.ndarray, indices: np.ndarray, probs: np.ndarray, target: int
+) -> np.ndarray:
+    """
+    Expected hitting times of target over a CSR transition matrix.
+
+    Solves (I - P) h = 1 with the row of target replaced by h[target] = 0, a
+    single scatter into the identity and one LU solve with no reduced copies.
+    The target column only multiplies h[target] = 0 so it is cleared as well,
+    which decouples the target and keeps its zero exact under pivoting.
+    :param indptr: CSR row pointers
+    :param indices: CSR column indices
+    :param probs: CSR probabilities
+    :param target: Index of the target state
+    :return: h[i] = expected steps from state i to target
+    """
+    n = len(indptr) - 1
+
+    A = np.eye(n)
+    A[np.repeat(np.arange(n), np.diff(indptr)), indices] -= probs
+    A[target] = 0.0
+    A[:, target] = 0.0
+    A[target, target] = 1.0
+
+    b = np.ones(n)
+    b[target] = 0.0
+    return np.linalg.solve(A, b)
+
+
+def gth_solve(P: np.ndarray) -> np.ndarray:
+    """
+    Stationary distribution of a stochastic matrix by Grassmann-Taksar-Heyman
+    elimination.
+
+    Each step censors the chain onto its remaining states using only additions
+    of non-negative terms, so there is no cancellation and no pivoting. The
+    diagonal is never read. For reducible matrices the elimination stops at the
+    first state with no mass left to move and returns a distribution supported
+    on the states before it.
+    :param P: n x n row-stochastic matrix, not modified
+    :return: Stationary distribution summing to 1
+    """
+    A = np.array(P, dtype=float)
+    n = len(A)
+    if n == 0:
+        return np.zeros(0)
+
+    for k in range(n - 1):
+        scale = A[k, k + 1 :].sum()
+        if scale <= 0:
+            # State k cannot leave 0..k, those states hold a closed class
+            n = k + 1
+            break
+        A[k + 1 : n, k] /= scale
+        A[k + 1 : n, k + 1 : n] += np.outer(A[k + 1 : n, k], A[k, k + 1 : n])
+
+    x = np.zeros(len(A))
+    x[n - 1] = 1.0
+    for k in range(n - 2, -1, -1):
+        x[k] = x[k + 1 : n] @ A[k + 1 : n, k]
+
+    return x / x.sum()
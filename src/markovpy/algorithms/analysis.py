@@ -1,5 +1,11 @@
 import numpy as np
 from markovpy import Chain
+from ._kernels import (
+    gth_solve,
+    hitting_times_csr,
+    power_iteration_csr,
+    power_iteration_dense,
+)
 
 
 def expected_hitting_times(chain: Chain, target: int | str) -> np.ndarray:
@@ -14,50 +20,56 @@ def expected_hitting_times(chain: Chain, target: int | str) -> np.ndarray:
     if isinstance(target, int):
         target_idx = target
     else:
-        try:
-            target_idx = list(chain.states).index(target)
-        except ValueError:
+        target_idx = chain._idx.get(target)
+        if target_idx is None:
             raise KeyError(f"State {target!r} not in chain")
 
-    # Get adjacency matrix
-    P = np.asarray(chain.to_adjacency_matrix())
-    n = P.shape[0]
+    indptr, indices, probs, _ = chain.to_csr()
+    n = len(indptr) - 1
 
     if not (0 <= target_idx < n):
         raise IndexError("Target index out of range")
 
-    # Build the linear system
-    A = np.eye(n)
-    b = np.zeros(n)
+    # h(target) = 0, h(i) - sum_j P[i, j] * h(j) = 1 otherwise
+    return hitting_times_csr(indptr, indices, probs, target_idx)
 
-    for i in range(n):
-        if i == target_idx:
-            A[i, :] = 0
-            A[i, i] = 1
-            b[i] = 0
-        else:
-            # h(i) - sum_j * P[i, j] * h(j) = 1
-            A[i, :] = np.eye(n)[i] - P[i, :]
-            b[i] = 1.0
 
-    h = np.linalg.solve(A, b)
-    return h
+def _normalised_dense(chain: Chain) -> np.ndarray:
+    """
+    Returns the row-normalised dense transition matrix of the chain.
+
+    States without outgoing mass are made absorbing with a self-loop of 1.
+    :param chain: A MarkovChain object.
+    :return: New n x n row-stochastic matrix in the order of chain.states.
+    """
+    P = chain._dense_matrix()
+    row_sums = P.sum(axis=1)
+    P = P / np.where(row_sums > 0, row_sums, 1.0)[:, None]
+    absorbing = np.flatnonzero(row_sums == 0)
+    P[absorbing, absorbing] = 1.0
+    return P
 
 
 def stationary_distribution(
-    chain: Chain, method: str = "auto", tol: float = 1e-12, max_iter: int = 10000
-) -> dict:
+    chain: Chain,
+    method: str = "auto",
+    tol: float = 1e-12,
+    max_iter: int = 10000,
+    return_array: bool = False,
+) -> dict | tuple[tuple, np.ndarray]:
     """
     Calculates the stationary distribution of the chain.
     :param chain: A MarkovChain object.
     :param method: "auto", "linear" or "power".
     :param tol: Optional Tolerance.
     :param max_iter: Optional max iterations of Power Method.
-    :return: set of stationary distribution.
+    :param return_array: If True, skip building the dict and return the states
+        with the distribution as an array in the same order.
+    :return: Dict of state to stationary probability, or (states, pi) if
+        return_array is True.
     """
     n = len(chain.states)
-    states = list(chain.states)
-    P = np.array(chain.to_adjacency_matrix(states, dense=True), dtype=float)
+    states = chain._state_list
 
     if method == "auto":
         if n <= 20:
@@ -66,33 +78,31 @@ def stationary_distribution(
             method = "power"
 
     if method == "linear":
-        # Solve π P = π  <=> (P.T - I) π^T = 0, sum π_i = 1
-        A = P.T - np.eye(n)
-
-        A = np.vstack([A, np.ones(n)])
-        b = np.zeros(n + 1)
-        b[-1] = 1
-        try:
-            pi = np.linalg.lstsq(A, b, rcond=None)[0]
-            pi = np.clip(pi, 0, None)  # Remove negative small values
-            pi /= pi.sum()
-        except np.linalg.LinAlgError:
-            raise ValueError("Linear algebra soloutio nfailed, try method ='power'")
+        # Solve π P = π, sum π_i = 1 by GTH elimination on the row-normalised matrix
+        pi = gth_solve(_normalised_dense(chain))
 
     elif method == "power":
 
-        row_sums = P.sum(axis=1, keepdims=True)
-        row_sums[row_sums == 0] = 1
-        P = P / row_sums
+        indptr, indices, probs, _ = chain.to_csr()
+
+        # States without outgoing mass are absorbing, as for method="linear"
+        if 4 * len(indices) >= n * n:
+            # Dense enough that a BLAS product beats gathering along the rows
+            pi = power_iteration_dense(_normalised_dense(chain), tol, max_iter)
+        else:
+            # Iterate on the CSR arrays, each step costs O(nnz) rather than O(n^2)
+            rows = chain.to_coo()[0]
 
-        pi = np.ones(n) / n
-        for _ in range(max_iter):
-            pi_next = pi @ P
-            if np.linalg.norm(pi_next - pi, 1) < tol:
-                pi = pi_next
-                break
-            pi = pi_next
+            row_sums = chain._row_sums()
+            absorbing = np.flatnonzero(row_sums == 0)
+            row_sums[absorbing] = 1.0
+            probs = probs / row_sums[rows]
 
+            pi = power_iteration_csr(
+                indptr, indices, probs, tol, max_iter, absorbing=absorbing
+            )
         pi /= pi.sum()
 
+    if return_array:
+        return tuple(states), pi
     return dict(zip(states, pi))
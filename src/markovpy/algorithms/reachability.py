@@ -1,3 +1,15 @@
+from array import array
+
+import numpy as np
+
+from ._kernels import (
+    _BITSET_MAX_STATES,
+    closure_bitset,
+    reachable_csr,
+    unpack_rows,
+)
+
+
 def can_step(chain, u, v) -> bool:
     """
     Returns true if state u can transition to state v
@@ -10,25 +22,122 @@ def can_step(chain, u, v) -> bool:
     return chain.has_transition(u, v)
 
 
-def reachable(chain, source) -> list:
+def _search_dict(adj: dict, source) -> set:
+    """
+    Depth first search over adjacency dicts, for chains without a cached CSR.
+    :param adj: State -> neighbour -> attribute dict
+    :param source: Source state
+    :return: Set of states reached from source, including source
+    """
+    visited = {source}
+    stack = [source]
+    while stack:
+        for v in adj[stack.pop()]:
+            if v not in visited:
+                visited.add(v)
+                stack.append(v)
+    return visited
+
+
+def reachable(chain, source) -> set:
     """
-    Returns a list of reachable states from state source
+    Returns a set of reachable states from state source
 
     :param chain: Chain of states
     :param source: Source state
-    :return: List of reachable states
+    :return: Set of reachable states
     """
-    visited = set()
-    stack = [source]
+    if "csr" not in chain._cache:
+        # A single search is cheaper than building the CSR it would run on
+        return _search_dict(chain._trans, source)
 
-    while stack:
-        u = stack.pop()
-        if u in visited:
-            continue
-        visited.add(u)
-        stack.extend(chain.successors(u))
+    n = len(chain)
+    if n <= _BITSET_MAX_STATES:
+        # Packed successor rows fit comfortably in memory, OR 64 states at a time
+        visited = unpack_rows(chain.reach_mask(source)[None], n)[0]
+    else:
+        indptr, indices, _, state_to_idx = chain.to_csr()
+        visited = reachable_csr(indptr, indices, state_to_idx[source])
 
-    return visited
+    states = chain._state_list
+    return {states[i] for i in np.flatnonzero(visited)}
+
+
+def reachable_reverse(chain, source) -> set:
+    """
+    Returns a set of states from which state source is reachable
+
+    Traverses the transitions backwards, over the reversed CSR arrays when cached.
+    :param chain: Chain of states
+    :param source: Target state
+    :return: Set of states that can reach source
+    """
+    if "csr_rev" not in chain._cache:
+        return _search_dict(chain._rev_trans, source)
+
+    indptr, indices, _, state_to_idx = chain.to_csr(reverse=True)
+    visited = reachable_csr(indptr, indices, state_to_idx[source])
+
+    states = chain._state_list
+    return {states[i] for i in np.flatnonzero(visited)}
+
+
+def reachability_matrix(chain) -> np.ndarray:
+    """
+    Returns the reachability of every state from every other state
+
+    Up to _BITSET_MAX_STATES states the closure is computed on packed bitsets,
+    larger chains stack one CSR search per source.
+    :param chain: Chain of states
+    :return: Boolean matrix in the order of chain.states, entry [i, j] is True
+        if state j is reachable from state i
+    """
+    indptr, indices, _, _ = chain.to_csr()
+    n = len(indptr) - 1
+    if n <= _BITSET_MAX_STATES:
+        return closure_bitset(indptr, indices)
+
+    reach = np.empty((n, n), dtype=bool)
+    for s in range(n):
+        reach[s] = reachable_csr(indptr, indices, s)
+    return reach
+
+
+def _reachable_cache(chain) -> dict:
+    """
+    Returns the memo of reachable sets for chain, keyed by source state.
+
+    The memo lives on the chain and is discarded whenever the chain is mutated.
+    :param chain: Chain of states
+    :return: Dict mapping source state to its set of reachable states
+    """
+    return chain._cached("reachable", dict)
+
+
+def _reachable_from(chain, source) -> set:
+    """
+    Memoised reachable, each source is only traversed once per chain version.
+    :param chain: Chain of states
+    :param source: Source state
+    :return: Set of reachable states, must not be mutated
+    """
+    fwd = _reachable_cache(chain)
+    if source not in fwd:
+        fwd[source] = reachable(chain, source)
+    return fwd[source]
+
+
+def _reachable_reverse_from(chain, source) -> set:
+    """
+    Memoised reachable_reverse, each source is only traversed once per chain version.
+    :param chain: Chain of states
+    :param source: Target state
+    :return: Set of states that can reach source, must not be mutated
+    """
+    rev = chain._cached("reachable_reverse", dict)
+    if source not in rev:
+        rev[source] = reachable_reverse(chain, source)
+    return rev[source]
 
 
 def communicates(chain, u, v) -> bool:
@@ -39,27 +148,107 @@ def communicates(chain, u, v) -> bool:
     :param v: Second State
     :return: Returns true if state u can transition to state v AND state v can transition to state u.
     """
-    return v in reachable(chain, u) and u in reachable(chain, v)
+    # Both traversals start from u, so repeated queries against u are cached
+    return v in _reachable_from(chain, u) and v in _reachable_reverse_from(chain, u)
 
 
 def communication_classes(chain) -> list:
     """
     Returns a list of communicating classes of chain
+
+    Communicating classes are the strongly connected components of the transition
+    graph, found with an iterative version of Tarjan's algorithm in O(V + E).
+    Classes are ordered by the first state of chain.states they contain.
     :param chain: Chain of states
     :return: List of communicating classes
     """
-    classes = []
-    seen = set()
+    indptr, indices, _, _ = chain.to_csr()
+    n = len(indptr) - 1
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+
+    # Integer state ids throughout, stacks are preallocated with manual top pointers
+    index = array("i", [-1]) * n
+    lowlink = array("i", [0]) * n
+    component = array("i", [-1]) * n
+    on_stack = bytearray(n)
+    next_edge = array("i", indptr[:-1])  # Next successor position of each state
+    stack = array("i", [0]) * n
+    frames = array("i", [0]) * n
+    top = 0
+    counter = 0
+    n_classes = 0
 
-    for s in chain.states:
-        if s in seen:
+    for root in range(n):
+        if index[root] != -1:
             continue
 
-        cls = {t for t in chain.states if communicates(chain, s, t)}
-        classes.append(cls)
-        seen |= cls
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack[top] = root
+        top += 1
+        on_stack[root] = 1
+        frames[0] = root
+        depth = 1
+
+        while depth:
+            u = frames[depth - 1]
+            k = next_edge[u]
+
+            if k < indptr[u + 1]:
+                next_edge[u] = k + 1
+                v = indices[k]
+                if index[v] == -1:
+                    index[v] = lowlink[v] = counter
+                    counter += 1
+                    stack[top] = v
+                    top += 1
+                    on_stack[v] = 1
+                    frames[depth] = v
+                    depth += 1
+                elif on_stack[v] and index[v] < lowlink[u]:
+                    lowlink[u] = index[v]
+                continue
+
+            # All successors of u explored
+            depth -= 1
+            if depth:
+                parent = frames[depth - 1]
+                if lowlink[u] < lowlink[parent]:
+                    lowlink[parent] = lowlink[u]
+
+            if lowlink[u] == index[u]:
+                # u is the root of a strongly connected component
+                while True:
+                    top -= 1
+                    w = stack[top]
+                    on_stack[w] = 0
+                    component[w] = n_classes
+                    if w == u:
+                        break
+                n_classes += 1
 
-    return classes
+    # Tarjan emits classes in reverse topological order, restore state order
+    classes = {}
+    for s, c in zip(chain.states, component):
+        classes.setdefault(c, set()).add(s)
+
+    return list(classes.values())
+
+
+def communication_class_of(chain, s) -> set:
+    """
+    Returns the communicating class containing state s
+
+    The classes are kept in a union-find on the chain, seeded from
+    communication_classes on first use and merged incrementally as transitions
+    are added afterwards.
+    :param chain: Chain of states
+    :param s: State to find the class of
+    :return: Set of states communicating with s
+    """
+    dsu = chain._class_dsu()
+    return set(dsu.members[dsu.find(s)])
 
 
 def is_closed(chain, cls) -> bool:
@@ -1,8 +1,76 @@
-from typing import List
+from bisect import bisect
+from itertools import accumulate
+from typing import List, Tuple
 import random
 from ..chain import Chain
 
 
+def _cdf_table(chain: Chain) -> Tuple[list, dict, list, list]:
+    """
+    Returns integer indexed successor and cumulative weight lists for every state.
+
+    Rows come from Chain.cdf_rows and keep successor insertion order, so sampling
+    from them consumes the same random numbers as random.choices.
+    :param chain: The Markov chain object
+    :return: (states, state_to_idx, successors, cumulative weights)
+    """
+    return (chain._state_list, chain._idx, *chain.cdf_rows())
+
+
+def _cdf_row(chain: Chain, state: str) -> Tuple[list, list]:
+    """
+    Returns the successor ids and cumulative weights of a single state.
+
+    The full rows of Chain.cdf_rows are used when already built, otherwise rows
+    are built on first use and cached per chain version, so a query after a
+    mutation only walks the transitions of the queried state.
+    :param chain: The Markov chain object
+    :param state: The state whose row is needed
+    :return: (successor ids, cumulative weights)
+    """
+    full = chain._cache.get("cdf")
+    if full is not None:
+        i = chain._idx[state]
+        return full[0][i], full[1][i]
+
+    rows = chain._cached("cdf_rows_lazy", dict)
+    row = rows.get(state)
+    if row is None:
+        idx = chain._idx
+        nbrs = chain._trans[state]
+        cum = list(accumulate(attr.get("p", 0) for attr in nbrs.values()))
+        row = rows[state] = ([idx[v] for v in nbrs], cum)
+    return row
+
+
+def _sample(state, sucs: list, cum: list):
+    """
+    Draws one successor from a cumulative row, like random.choices would.
+
+    :param state: State the row belongs to, used in error messages
+    :param sucs: Successors of state
+    :param cum: Cumulative weights of the successors
+    :return: The chosen successor
+    """
+    if not cum:
+        raise ValueError(f"No outgoing transitions from state '{state}'")
+    if not cum[-1] > 0:
+        raise ValueError(f"No outgoing probability mass from state '{state}'")
+    return sucs[bisect(cum, random.random() * cum[-1], 0, len(cum) - 1)]
+
+
+def _step(table: Tuple[list, dict, list, list], current: int) -> int:
+    """
+    Samples the next integer state id from the cached table.
+
+    :param table: Table from _cdf_table
+    :param current: Current state id
+    :return: Next state id
+    """
+    states, _, sucs, cums = table
+    return _sample(states[current], sucs[current], cums[current])
+
+
 def next_state(chain: Chain, current: str) -> str:
     """
     Return a single next state from `current` according to the chain's
@@ -12,13 +80,7 @@ def next_state(chain: Chain, current: str) -> str:
     :param current: The current state from which to transition.
     :return: The next state chosen randomly according to probabilities.
     """
-
-    sucs = list(chain.successors(current))
-    if not sucs:
-        raise ValueError(f"No outgoing transitions from state '{current}'")
-
-    weights = [chain._trans[current][s].get("p", 0) for s in sucs]
-    return random.choices(sucs, weights=weights, k=1)[0]
+    return chain._state_list[_sample(current, *_cdf_row(chain, current))]
 
 
 def simulate(chain: Chain, start: str, steps: int) -> List[str]:
@@ -32,12 +94,16 @@ def simulate(chain: Chain, start: str, steps: int) -> List[str]:
     if start not in chain.states:
         raise ValueError(f"State '{start}' is not in the chain")
 
-    route = [start]
-    current = start
+    # Walk on integer ids, mapping back to labels at the end
+    table = _cdf_table(chain)
+    states, state_to_idx, _, _ = table
+
+    current = state_to_idx[start]
+    path = [current]
     for _ in range(steps):
-        current = next_state(chain, current)
-        route.append(current)
-    return route
+        current = _step(table, current)
+        path.append(current)
+    return [states[i] for i in path]
 
 
 def simulate_until(chain: Chain, start: str, target) -> List[str]:
@@ -51,9 +117,12 @@ def simulate_until(chain: Chain, start: str, target) -> List[str]:
     if start not in chain.states:
         raise ValueError(f"State '{start}' is not in the chain")
 
-    route = [start]
-    current = start
-    while current not in target:
-        current = next_state(chain, current)
-        route.append(current)
-    return route
+    table = _cdf_table(chain)
+    states, state_to_idx, _, _ = table
+
+    current = state_to_idx[start]
+    path = [current]
+    while states[current] not in target:
+        current = _step(table, current)
+        path.append(current)
+    return [states[i] for i in path]
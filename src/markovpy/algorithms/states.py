@@ -16,13 +16,20 @@ def is_absorbing(chain, s, tol=1e-12) -> bool:
     return False
 
 
-def absorbing_states(chain) -> set:
+def absorbing_states(chain, tol=1e-12) -> set:
     """
     Returns a set of absorbing states
     :param chain: Chain of states
+    :param tol: Optional tolerance for absorbing states
     :return: Set of absorbing states
     """
-    return {s for s in chain.states if is_absorbing(chain, s)}
+    # Inlined is_absorbing, avoids a call and a lookup per state
+    return {
+        s
+        for s, nbrs in chain._trans.items()
+        if not nbrs
+        or (len(nbrs) == 1 and s in nbrs and abs(nbrs[s].get("p", 0) - 1.0) < tol)
+    }
 
 
 def is_transient(chain, s) -> bool:
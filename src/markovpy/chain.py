@@ -1,6 +1,62 @@
 import numpy as np
+from collections import OrderedDict
+from itertools import accumulate, chain as iter_chain, repeat
 from typing import Iterable, Tuple, Any
 
+# Number of explicit state orders whose matrices and permutations are kept
+_ORDER_CACHE_SIZE = 8
+
+
+def _as_list(values: Iterable) -> list:
+    """
+    Converts NumPy arrays to lists of Python scalars, other iterables to lists.
+    :param values: Iterable to convert.
+    :return: List of values.
+    """
+    if isinstance(values, np.ndarray):
+        return values.tolist()
+    return list(values)
+
+
+class _DisjointSet:
+    """
+    Union-find over states with path compression and union by size.
+
+    Each root also keeps the set of its members, so a whole class can be read
+    back without scanning every state.
+    """
+
+    __slots__ = ("parent", "members")
+
+    def __init__(self):
+        self.parent = {}
+        self.members = {}
+
+    def add(self, s):
+        """Adds s as a singleton, if not already present."""
+        if s not in self.parent:
+            self.parent[s] = s
+            self.members[s] = {s}
+
+    def find(self, s):
+        """Returns the root of the set containing s."""
+        root = s
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[s] != root:
+            self.parent[s], s = root, self.parent[s]
+        return root
+
+    def union(self, a, b):
+        """Merges the sets containing a and b."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if len(self.members[a]) < len(self.members[b]):
+            a, b = b, a
+        self.parent[b] = a
+        self.members[a] |= self.members.pop(b)
+
 
 class Chain:
     """
@@ -11,6 +67,10 @@ class Chain:
 
     This class stores structures only, algorithms are implemented externally.
 
+    Derived structures such as the CSR arrays are cached until the chain is
+    mutated through its methods. The attribute dicts yielded by transitions()
+    are the stored ones, after editing them in place call invalidate().
+
     :param data: Optional Iterable data, converted to states.
     :param attr: Optional attributes.
     """
@@ -30,6 +90,23 @@ class Chain:
         # State -> successor -> transition attribution dict
         self._trans = {}  # Trans Rights
 
+        # State -> position in insertion order, states are never removed
+        self._idx = {}
+
+        # States in insertion order, position i holds the state with _idx i
+        self._state_list = []
+
+        # State -> predecessor -> transition attribution dict, shared with _trans
+        self._rev_trans = {}
+
+        # Mutation counter and derived structures built from the current version
+        self._version = 0
+        self._cache = {}
+
+        # Union-find of communicating classes, built on first query and then
+        # kept up to date as transitions are added
+        self._dsu = None
+
         # Data should be an iterable of state labels
         if data is not None:
             self.add_states_from(data)
@@ -40,8 +117,19 @@ class Chain:
         :param attr: Any other attributes.
         """
         if s not in self._states:
+            out_mass = self._cache.get("out_mass")
+            self._idx[s] = len(self._idx)
+            self._state_list.append(s)
             self._states[s] = {}
             self._trans[s] = {}
+            self._rev_trans[s] = {}
+            if self._dsu is not None:
+                self._dsu.add(s)
+            self._invalidate()
+            if out_mass is not None:
+                # A new state has no outgoing mass, the other rows are unchanged
+                out_mass[s] = 0.0
+                self._cache["out_mass"] = out_mass
         self._states[s].update(attr)
 
     def add_states_from(self, states: Iterable[str], **attr):
@@ -59,14 +147,135 @@ class Chain:
         :param p: Optional probability float.
         :param attr: Any other attributes.
         """
+        out_mass = self._cache.get("out_mass")
         self.add_state(u)
         self.add_state(v)
-        self._trans[u][v] = {"p": p, **attr}  # Optional p value.
+        attr = {"p": p, **attr}  # Optional p value.
+        self._trans[u][v] = self._rev_trans[v][u] = attr
+        if self._dsu is not None:
+            self._merge_classes(u, v)
+        self._invalidate()
+
+        if out_mass is not None:
+            # Only the row of u changed, it is resummed on its next query
+            out_mass.pop(u, None)
+            self._cache["out_mass"] = out_mass
+
+    def _merge_classes(self, u, v):
+        """
+        Updates the communicating class union-find for a new transition u -> v.
+
+        The edge joins every class on a path v -> ... -> u into one class, so the
+        states reachable from v that can also reach u are merged.
+        :param u: Transition origin state.
+        :param v: Transition target state.
+        """
+        dsu = self._dsu
+        if dsu.find(u) == dsu.find(v):
+            return
+
+        forward = set()
+        stack = [v]
+        while stack:
+            w = stack.pop()
+            if w not in forward:
+                forward.add(w)
+                stack.extend(self._trans[w])
+
+        if u not in forward:
+            return
+
+        # Walk back from u, staying inside the states reachable from v
+        cycle = set()
+        stack = [u]
+        while stack:
+            w = stack.pop()
+            if w not in cycle:
+                cycle.add(w)
+                stack.extend(x for x in self._rev_trans[w] if x in forward)
+
+        for w in cycle:
+            dsu.union(u, w)
+
+    def _class_dsu(self) -> _DisjointSet:
+        """
+        Returns the union-find of communicating classes, see communication_class_of.
+
+        Seeded from communication_classes on first use, after that add_state and
+        add_transition keep it up to date.
+        :return: Union-find over the states, must not be mutated.
+        """
+        if self._dsu is None:
+            from .algorithms.reachability import communication_classes
+
+            dsu = _DisjointSet()
+            for cls in communication_classes(self):
+                first = next(iter(cls))
+                for t in cls:
+                    dsu.add(t)
+                    dsu.union(first, t)
+            self._dsu = dsu
+        return self._dsu
+
+    def invalidate(self):
+        """
+        Discards every cached derived structure of the chain.
+
+        Needed only after editing transition attribute dicts in place, for
+        example those yielded by transitions(), the chain's own methods already
+        keep the caches up to date.
+        """
+        self._invalidate()
+
+    def _invalidate(self):
+        """
+        Marks the chain as mutated, discarding any cached derived structures.
+
+        Called by every method that changes states or transitions. Editing
+        transition attribute dicts in place bypasses this, see invalidate.
+        """
+        self._version += 1
+        self._cache.clear()
+
+    def _cached(self, key, build):
+        """
+        Returns the cached value for key, building it on first use.
+        :param key: Cache key.
+        :param build: Zero argument callable producing the value.
+        :return: Cached value, valid until the chain is next mutated.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = build()
+            return value
+
+    def _cached_per_order(self, key, states: tuple, build):
+        """
+        Returns the cached value of key for one state order, building it on first use.
+
+        Only the _ORDER_CACHE_SIZE most recently used orders are kept, so looping
+        over many orders does not hold on to a matrix per order.
+        :param key: Cache key.
+        :param states: State order, a tuple.
+        :param build: Callable taking states and producing the value.
+        :return: Cached value, valid until the chain is next mutated.
+        """
+        entries = self._cached(key, OrderedDict)
+        value = entries.get(states)
+        if value is None:
+            value = entries[states] = build(states)
+            if len(entries) > _ORDER_CACHE_SIZE:
+                entries.popitem(last=False)
+        else:
+            entries.move_to_end(states)
+        return value
 
     @property
     def states(self):
         """
-        :return: Set of states.
+        :return: Live, insertion ordered keys view of the states. It supports set
+            comparisons and O(1) membership without copying.
         """
         return self._states.keys()
 
@@ -79,16 +288,20 @@ class Chain:
         Else:
             iterate over (u, v, attr) for fixed u.
 
+        attr is the stored attribute dict, not a copy. Cached matrices and
+        analysis results do not see in place edits until invalidate() is called.
+
         :param u: State to return transitions from (Optional).
-        :yields: All transitions v -> u.
+        :return: Iterator over all transitions u -> v.
         """
         if u is None:
-            for u, neighbours in self._trans.items():
-                for v, attr in neighbours.items():
-                    yield u, v, attr
-        else:
-            for v, attr in self._trans.get(u, {}).items():
-                yield u, v, attr
+            # zip and chain run in C, only the per-state generator is in Python
+            return iter_chain.from_iterable(
+                zip(repeat(u), neighbours, neighbours.values())
+                for u, neighbours in self._trans.items()
+            )
+        neighbours = self._trans.get(u, {})
+        return zip(repeat(u), neighbours, neighbours.values())
 
     def add_transitions_from(self, data: Iterable[Tuple]):
         """
@@ -103,6 +316,17 @@ class Chain:
         :param data: Iterable Tuples to add data from.
         :raises ValueError: If not in acceptable form.
         """
+        data = list(data)
+        lengths = {len(e) for e in data}
+
+        # Uniform (u, v) or (u, v, p) input goes through the bulk path
+        if lengths == {2}:
+            self.add_transitions_bulk(*zip(*data))
+            return
+        if lengths == {3} and not any(isinstance(e[2], dict) for e in data):
+            self.add_transitions_bulk(*zip(*data))
+            return
+
         for e in data:
             if len(e) == 2:  # Only (U, V)
                 u, v = e
@@ -119,6 +343,37 @@ class Chain:
             else:
                 raise ValueError("Invalid transition")
 
+    def add_transitions_bulk(self, us: Iterable, vs: Iterable, ps: Iterable = None):
+        """
+        Adds transitions us[k] -> vs[k] with probability ps[k] in a single pass.
+
+        Skips the per-edge dispatch of add_transitions_from and add_transition,
+        caches are invalidated once at the end. Accepts lists or NumPy arrays.
+
+        :param us: Transition origin states.
+        :param vs: Transition target states.
+        :param ps: Optional transition probabilities.
+        :raises ValueError: If the inputs differ in length.
+        """
+        us, vs = _as_list(us), _as_list(vs)
+        ps = [None] * len(us) if ps is None else _as_list(ps)
+        if not len(us) == len(vs) == len(ps):
+            raise ValueError("Transition arrays must have the same length")
+
+        states = self._states
+        trans = self._trans
+        rev_trans = self._rev_trans
+        for u, v, p in zip(us, vs, ps):
+            if u not in states:
+                self.add_state(u)
+            if v not in states:
+                self.add_state(v)
+            trans[u][v] = rev_trans[v][u] = {"p": p}
+
+        # Cheaper to rebuild the classes on next query than to merge per edge
+        self._dsu = None
+        self._invalidate()
+
     def successors(self, u: str) -> set:
         """
         Returns all v where u can transition to v.
@@ -132,9 +387,10 @@ class Chain:
         """
         Returns all u where u can transition to v.
         :param v: Target state to find transitions.
-        :return: List of States that u can transition to.
+        :return: Keys view of the states that can transition to v, in the order
+            their transitions were added.
         """
-        return {u for u, neighbors in self._trans.items() if v in neighbors}
+        return self._rev_trans.get(v, {}).keys()
 
     def has_state(self, s: str) -> bool:
         """
@@ -160,9 +416,13 @@ class Chain:
         If there is no outgoing edge from u to v, returns 0
         :param u: Origin of the weight to find
         :param v: Target of the weight to find
-        :return:
+        :return: Transition probability, 0 if there is no transition, either state
+            is unknown or the transition has no p.
         """
-        return self._trans[u].get(v, 0.0)["p"]
+        try:
+            return self._trans[u][v]["p"] or 0.0
+        except KeyError:
+            return 0.0
 
     def out_degree(self, u: str, weight: str = None) -> float:
         """
@@ -173,9 +433,23 @@ class Chain:
         :return: Sum or count of weights of outgoing edges.
         """
         if weight == "p":
-            return sum(attr.get("p", 0) for attr in self._trans[u].values())
+            # Rows are summed on first query and kept until they change
+            out_mass = self._cached("out_mass", dict)
+            try:
+                return out_mass[u]
+            except KeyError:
+                mass = out_mass[u] = self._out_mass_of(u)
+                return mass
         return len(self._trans[u])
 
+    def _out_mass_of(self, u) -> float:
+        """
+        Sums the outgoing p of u in insertion order, see out_degree.
+        :param u: State to sum.
+        :return: Outgoing probability mass of u, None counts as 0.
+        """
+        return float(sum((a["p"] or 0) for a in self._trans[u].values()))
+
     def in_degree(self, v: str, weight: str = None) -> float:
         """
         Returns the number of entering edges if weight is none.
@@ -184,16 +458,10 @@ class Chain:
         :param weight: "p" returns sum.
         :return: Sum or count of weight of entering edges.
         """
-        deg = 0.0
-
-        for u, neighbours in self._trans.items():
-            if v in neighbours:
-                if weight == "p":
-                    deg += neighbours[v].get("p", 0)
-                else:
-                    deg += 1
-
-        return deg
+        preds = self._rev_trans.get(v, {})
+        if weight == "p":
+            return sum(attr.get("p", 0) for attr in preds.values())
+        return len(preds)
 
     def is_stochastic(self, tol: float = 1e-12) -> bool:
         """
@@ -201,23 +469,268 @@ class Chain:
         :param tol: Optional Tolerance.
         :return: True if chain is stochastic.
         """
-        for u, neighbours in self._trans.items():
-            if not neighbours:
-                continue  # allow absorbing states
-            total = sum(attr.get("p", 0) for attr in neighbours.values())
-            if abs(total - 1.0) > tol:
+        csr = self._cache.get("csr")
+        if csr is None:
+            # Building the CSR costs more than the check, walk the dicts instead
+            for nbrs in self._trans.values():
+                if not nbrs:
+                    continue  # allow absorbing states
+                total = sum((attr["p"] or 0) for attr in nbrs.values())
+                if abs(total - 1.0) > tol:
+                    return False
+            return True
+
+        indptr, _, probs, _ = csr
+
+        # Blocks of rows, so a failing row returns without summing the rest
+        n = len(indptr) - 1
+        for start in range(0, n, 4096):
+            stop = min(start + 4096, n)
+            starts = indptr[start:stop]
+            ends = indptr[start + 1 : stop + 1]
+
+            # Rows without transitions count as summing to 1, allowing absorbing states
+            block = probs[starts[0] : ends[-1]]
+            sums = np.add.reduceat(block, starts[starts < ends] - starts[0])
+            if not np.all(np.abs(sums - 1.0) <= tol):
                 return False
+
         return True
 
     def normalise(self):
         """
         Takes the sums of the weights and normalises them to 1
         """
-        for u in self._trans:
-            total = sum(attr.get("p", 0) for attr in self._trans[u].values())
-            if total > 0:
-                for v in self._trans[u]:
-                    self._trans[u][v]["p"] /= total
+        if "csr" not in self._cache:
+            # Without a CSR to reuse one pass over each row's dict is cheapest
+            for nbrs in self._trans.values():
+                total = sum((attr["p"] or 0) for attr in nbrs.values())
+                if total > 0:
+                    for attr in nbrs.values():
+                        attr["p"] = (attr["p"] or 0) / total
+            self._invalidate()
+            return
+
+        indptr, indices, probs, state_to_idx = self.to_csr()
+        row_sums = self._row_sums()
+        scale = np.repeat(np.where(row_sums > 0, row_sums, 1.0), np.diff(indptr))
+
+        # Rows are grouped the same way in dict and CSR order, so one scale serves both
+        attrs = [attr for nbrs in self._trans.values() for attr in nbrs.values()]
+        values = np.fromiter(
+            (attr["p"] or 0.0 for attr in attrs), dtype=np.float64, count=len(attrs)
+        )
+        for attr, p in zip(attrs, (values / scale).tolist()):
+            attr["p"] = p
+
+        normalised = probs / scale
+        normalised.flags.writeable = False
+
+        self._invalidate()
+        # The structure is unchanged, keep the CSR form valid for the next query
+        self._cache["csr"] = (indptr, indices, normalised, state_to_idx)
+
+    def _row_sums(self) -> np.ndarray:
+        """
+        Returns the outgoing probability mass of every state, in the order of chain.states.
+        :return: Array of row sums, 0 for states without transitions.
+        """
+        if "csr" not in self._cache:
+            return np.fromiter(
+                (self._out_mass_of(s) for s in self._trans), np.float64, len(self)
+            )
+
+        indptr, _, probs, _ = self.to_csr()
+
+        sums = np.zeros(len(indptr) - 1)
+        nonempty = indptr[:-1] < indptr[1:]
+        if probs.size:
+            # reduceat over the start of each non-empty row sums the whole row
+            sums[nonempty] = np.add.reduceat(probs, indptr[:-1][nonempty])
+        return sums
+
+    def to_csr(
+        self, reverse: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Returns the transitions in compressed sparse row form.
+
+        States are indexed in the order of chain.states, columns are sorted within
+        each row and missing probabilities are stored as 0. The arrays are cached
+        until the chain is mutated and are read-only.
+
+        :param reverse: If True, rows hold predecessors instead of successors.
+        :return: (indptr, indices, probs, state_to_idx), successors of state i are
+            indices[indptr[i]:indptr[i + 1]] with probabilities probs[indptr[i]:indptr[i + 1]].
+        """
+        if reverse:
+            return self._cached("csr_rev", self._build_reverse_csr)
+        return self._cached("csr", self._build_csr)
+
+    def _build_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Walks the transition dicts once to build the CSR arrays.
+        :return: (indptr, indices, probs, state_to_idx)
+        """
+        state_to_idx = dict(self._idx)
+        n = len(state_to_idx)
+
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        indptr[1:] = np.cumsum([len(nbrs) for nbrs in self._trans.values()])
+        nnz = int(indptr[-1])
+
+        indices = np.fromiter(
+            (state_to_idx[v] for nbrs in self._trans.values() for v in nbrs),
+            dtype=np.int32,
+            count=nnz,
+        )
+        probs = np.fromiter(
+            (
+                attr.get("p") or 0.0
+                for nbrs in self._trans.values()
+                for attr in nbrs.values()
+            ),
+            dtype=np.float64,
+            count=nnz,
+        )
+
+        # Sort columns within each row
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        order = np.lexsort((indices, rows))
+        indices = indices[order]
+        probs = probs[order]
+
+        for arr in (indptr, indices, probs):
+            arr.flags.writeable = False
+
+        return indptr, indices, probs, state_to_idx
+
+    def to_coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Returns the transitions as coordinate arrays, one entry per transition.
+
+        Entries are in the same order as to_csr, so cols and probs are the CSR
+        indices and probs. Cached until the chain is mutated, read-only.
+
+        :return: (rows, cols, probs, state_to_idx), transition k is
+            rows[k] -> cols[k] with probability probs[k].
+        """
+        return self._cached("coo", self._build_coo)
+
+    def _build_coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Expands the CSR row pointers into a row index per transition.
+        :return: (rows, cols, probs, state_to_idx)
+        """
+        indptr, indices, probs, state_to_idx = self.to_csr()
+
+        rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+        rows.flags.writeable = False
+
+        return rows, indices, probs, state_to_idx
+
+    def _build_reverse_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Transposes the forward CSR arrays, a stable sort on column keeps the
+        predecessors of each state sorted.
+        :return: (indptr, indices, probs, state_to_idx) of the reversed chain
+        """
+        rows, indices, probs, state_to_idx = self.to_coo()
+        n = len(state_to_idx)
+
+        order = np.argsort(indices, kind="stable")
+
+        rev_indptr = np.zeros(n + 1, dtype=np.int32)
+        rev_indptr[1:] = np.cumsum(np.bincount(indices, minlength=n))
+        rev_indices = rows[order]
+        rev_probs = probs[order]
+
+        for arr in (rev_indptr, rev_indices, rev_probs):
+            arr.flags.writeable = False
+
+        return rev_indptr, rev_indices, rev_probs, state_to_idx
+
+    def cdf_rows(self) -> Tuple[list, list]:
+        """
+        Returns the cumulative transition probabilities of every state.
+
+        Rows are indexed by the position of each state in chain.states and keep
+        successor insertion order. Cached until the chain is mutated.
+
+        :return: (successors, cdfs), successors[i] lists the successor indices of
+            state i and cdfs[i] the running totals of their probabilities.
+        """
+        return self._cached("cdf", self._build_cdf_rows)
+
+    def _build_cdf_rows(self) -> Tuple[list, list]:
+        """
+        Walks the transition dicts once to build the cumulative rows.
+        :return: (successors, cdfs)
+        """
+        successors = [[self._idx[v] for v in nbrs] for nbrs in self._trans.values()]
+        cdfs = [
+            list(accumulate(attr.get("p", 0) for attr in nbrs.values()))
+            for nbrs in self._trans.values()
+        ]
+        return successors, cdfs
+
+    def _succ_bits(self) -> np.ndarray:
+        """
+        Returns the successors of every state as packed uint64 bitsets.
+
+        Row i has bit j % 64 of word j // 64 set if state i transitions to state
+        j, states are indexed in the order of chain.states. Cached until the
+        chain is mutated, the returned array is read-only.
+        :return: n x ceil(n / 64) uint64 matrix.
+        """
+        return self._cached("succ_bits", self._build_succ_bits)
+
+    def _build_succ_bits(self) -> np.ndarray:
+        """
+        Sets one bit per CSR entry.
+        :return: n x ceil(n / 64) uint64 matrix.
+        """
+        from .algorithms._kernels import successor_bitsets
+
+        indptr, indices, _, _ = self.to_csr()
+        bits = successor_bitsets(indptr, indices)
+        bits.flags.writeable = False
+        return bits
+
+    def reach_mask(self, src) -> np.ndarray:
+        """
+        Returns the states reachable from src as a packed bitset.
+        :param src: Source state.
+        :return: uint64 array, bit j % 64 of word j // 64 is set if the j-th state
+            of chain.states is reachable from src.
+        """
+        from .algorithms._kernels import reach_bitset
+
+        indptr, indices, _, _ = self.to_csr()
+        return reach_bitset(self._succ_bits(), self._idx[src], indptr, indices)
+
+    def _dense_matrix(self) -> np.ndarray:
+        """
+        Returns the dense transition matrix in the order of chain.states.
+
+        Built from the CSR arrays and cached until the chain is mutated, the
+        returned array is read-only.
+        :return: n x n transition matrix.
+        """
+        return self._cached("dense", self._build_dense_matrix)
+
+    def _build_dense_matrix(self) -> np.ndarray:
+        """
+        Scatters the coordinate arrays into a dense matrix.
+        :return: n x n transition matrix.
+        """
+        rows, cols, probs, state_to_idx = self.to_coo()
+        n = len(state_to_idx)
+
+        matrix = np.zeros((n, n))
+        matrix[rows, cols] = probs
+        matrix.flags.writeable = False
+        return matrix
 
     def __len__(self) -> int:
         return len(self._states)
@@ -244,7 +757,7 @@ class Chain:
 
         The adjacency matrix is interpreted row-wise
 
-        :param matrix: Sequence of Sequences of non-negative numbers
+        :param matrix: Sequence of Sequences of non-negative numbers, or a 2D ndarray
         :param states: Optional state labels
         :param normalise: Optional, rows of matrix normalised to 1
         :param validate: Optional, validates the matrix for correctness
@@ -258,20 +771,79 @@ class Chain:
         if validate:
             cls._validate_matrix(matrix, states)
 
-        if states is None:
-            states = list(range(n))
+        # Float ndarrays are used without a copy
+        M = np.asarray(matrix, dtype=float)
+        if normalise:
+            row_sums = M.sum(axis=1, keepdims=True)
+            # Rows that already sum to 1 would be divided by 1, skip the pass
+            if not np.allclose(row_sums, 1.0, rtol=0.0, atol=1e-12):
+                # Zero rows, only possible without validation, stay empty
+                M = np.divide(M, row_sums, out=np.zeros_like(M), where=row_sums > 0)
 
-        chain = cls()
+        # Row-major nonzero extraction gives the CSR arrays directly
+        rows, cols = np.nonzero(M > 0)
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        indptr[1:] = np.cumsum(np.bincount(rows, minlength=n))
 
-        for i, row in enumerate(matrix):
-            total = sum(row)
+        return cls.from_csr(indptr, cols, M[rows, cols], states)
 
-            for j, value in enumerate(row):
-                if value <= 0:
-                    continue
+    @classmethod
+    def from_csr(
+        cls,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        probs: np.ndarray,
+        states: Iterable[str] = None,
+    ):
+        """
+        Constructs a Markov chain from compressed sparse row arrays, see to_csr.
 
-                prob = value / total if normalise else value
-                chain.add_transition(states[i], states[j], prob)
+        :param indptr: Row pointers, length n + 1.
+        :param indices: Column index of each transition.
+        :param probs: Probability of each transition.
+        :param states: Optional state labels, defaults to 0..n-1.
+        :return: Chain
+        :raises ValueError: If the arrays are inconsistent.
+        """
+        indptr = np.asarray(indptr)
+        n = len(indptr) - 1
+
+        if n < 0 or len(indices) != len(probs) or indptr[-1] != len(indices):
+            raise ValueError("Inconsistent CSR arrays")
+
+        # Negative columns would wrap around to the last states
+        cols = np.asarray(indices)
+        if indptr[0] != 0 or not np.all(np.diff(indptr) >= 0):
+            raise ValueError("Inconsistent CSR arrays")
+        if len(cols) and (cols.min() < 0 or cols.max() >= n):
+            raise ValueError("Inconsistent CSR arrays")
+
+        states = list(range(n)) if states is None else list(states)
+        if len(states) != n:
+            raise ValueError("Number of states must match matrix dimension")
+
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+
+        chain = cls(states)
+        chain.add_transitions_bulk(
+            [states[i] for i in rows.tolist()],
+            [states[j] for j in cols.tolist()],
+            probs,
+        )
+
+        # In-range, strictly increasing columns within each row, as
+        # from_adjacency_matrix produces, are exactly what to_csr would build,
+        # so keep them
+        same_row = rows[1:] == rows[:-1]
+        if len(chain) == n and np.all(cols[1:][same_row] > cols[:-1][same_row]):
+            csr = (
+                indptr.astype(np.int32),
+                cols.astype(np.int32),
+                np.array(probs, dtype=np.float64),
+            )
+            for arr in csr:
+                arr.flags.writeable = False
+            chain._cache["csr"] = (*csr, dict(chain._idx))
 
         return chain
 
@@ -283,23 +855,24 @@ class Chain:
         :param states: Optional States
         :raises ValueError: if matrix is not valid
         """
-        n = len(matrix)
+        try:
+            M = np.asarray(matrix, dtype=float)
+        except ValueError:  # Ragged rows
+            raise ValueError(f"Matrix {matrix} must be square") from None
 
         # Check square
-        for row in matrix:
-            if len(row) != n:
-                raise ValueError(f"Matrix {matrix} must be square")
+        if M.ndim != 2 or M.shape[0] != M.shape[1]:
+            raise ValueError(f"Matrix {matrix} must be square")
 
         # Check states same size as matrix
-        if states is not None and len(states) != n:
+        if states is not None and len(states) != len(M):
             raise ValueError(f"Number of states must match matrix dimension")
 
         # Non-negativity, non-zero
-        for row in matrix:
-            if any(x < 0 for x in row):
-                raise ValueError(f"Matrix entries must be non-negative")
-            if sum(row) == 0:
-                raise ValueError(f"Matrix rows must be non-zero")
+        if (M < 0).any():
+            raise ValueError(f"Matrix entries must be non-negative")
+        if not M.sum(axis=1).all():
+            raise ValueError(f"Matrix rows must be non-zero")
 
     @staticmethod
     def _validate_transitions(transitions: Iterable, tol: float = 1e-12):
@@ -319,126 +892,189 @@ class Chain:
                 )
 
     def to_adjacency_matrix(
-        self, states: list = None, dense: bool = True
-    ) -> list[list[float]] | dict[Any, Any]:
+        self,
+        states: list = None,
+        dense: bool = True,
+        as_dict: bool = True,
+        as_list: bool = False,
+    ) -> np.ndarray | list[list[float]] | dict[Any, Any] | tuple:
         """
         Converts a chain object to an adjacency matrix.
         :param states: Option states.
         :param dense: Bool, if True returns dense matrix.
-        :return: Adjacency matrix.
+        :param as_dict: Bool, only used when dense is False. If True returns a dict
+            of dicts, else the (indptr, indices, probs) arrays of the matrix in
+            compressed sparse row form, see to_csr.
+        :param as_list: Bool, only used when dense is True. If True returns the
+            matrix as nested lists.
+        :return: Adjacency matrix, dense matrices are NumPy arrays. They are cached
+            per state order until the chain is mutated and are read-only, copy
+            them before modifying.
         """
-        if states is None:
-            states = list(self.states)
-
+        if dense and as_list:
+            return self.to_adjacency_matrix(states).tolist()
         if dense:
-            n = len(states)
-
-            matrix = [[0.0 for _ in range(n)] for _ in range(n)]
-
-            state_index = {s: i for i, s in enumerate(states)}
-
-            for i, u in enumerate(states):
-                for v in self.successors(u):
-                    j = state_index[v]
-                    matrix[i][j] = self.transition_mass(u, v)
-            return matrix
+            if states is None:
+                return self._dense_matrix()
+
+            key = tuple(states)
+            if key == self._cached("states_tuple", lambda: tuple(self._state_list)):
+                return self._dense_matrix()
+
+            return self._cached_per_order(
+                "dense_ordered", key, self._build_ordered_matrix
+            )
+        elif not as_dict:
+            if states is None:
+                return self.to_csr()[:3]
+            return self._build_ordered_csr(tuple(states))
         else:
+            if states is None:
+                states = self._state_list
+
             matrix = {}
             for u in states:
-                matrix[u] = {v: self.transition_mass(u, v) for v in self.successors(u)}
+                matrix[u] = {v: attr["p"] for v, attr in self._trans[u].items()}
             return matrix
 
+    def _perm(self, states: tuple) -> np.ndarray:
+        """
+        Returns the index of each of states, shared by the ordered conversions and
+        cached per order until the chain is mutated.
+        :param states: Requested state order.
+        :return: Read-only index array, entry k is the index of states[k].
+        """
+        return self._cached_per_order("perm", states, self._build_perm)
+
+    def _build_perm(self, states: tuple) -> np.ndarray:
+        """
+        Looks up the index of every state once.
+        :param states: Requested state order.
+        :return: Read-only index array.
+        """
+        idx = self._idx
+        perm = np.fromiter((idx[s] for s in states), np.intp, len(states))
+        perm.flags.writeable = False
+        return perm
+
+    def _build_ordered_matrix(self, states: tuple) -> np.ndarray:
+        """
+        Scatters the coordinate arrays straight into the requested order.
+        :param states: Row and column order, states not listed are dropped.
+        :return: Read-only transition matrix.
+        """
+        rows, cols, probs, state_to_idx = self.to_coo()
+        position = np.full(len(state_to_idx), -1)
+        position[self._perm(states)] = np.arange(len(states))
+
+        rows = position[rows]
+        cols = position[cols]
+        keep = (rows >= 0) & (cols >= 0)
+
+        matrix = np.zeros((len(states), len(states)))
+        matrix[rows[keep], cols[keep]] = probs[keep]
+        matrix.flags.writeable = False
+        return matrix
+
+    def _build_ordered_csr(
+        self, states: tuple
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Relabels the coordinate arrays into the requested order as CSR arrays.
+        :param states: Row and column order, states not listed are dropped.
+        :return: (indptr, indices, probs) with columns sorted within each row.
+        """
+        rows, cols, probs, state_to_idx = self.to_coo()
+        n = len(states)
+        position = np.full(len(state_to_idx), -1, dtype=np.int32)
+        position[self._perm(states)] = np.arange(n)
+
+        rows = position[rows]
+        cols = position[cols]
+        keep = np.flatnonzero((rows >= 0) & (cols >= 0))
+        keep = keep[np.lexsort((cols[keep], rows[keep]))]
+
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        indptr[1:] = np.cumsum(np.bincount(rows[keep], minlength=n))
+        return indptr, cols[keep], probs[keep]
+
     @classmethod
     def merge(cls, chain1, chain2, merge_type: str = "add", normalise: bool = True):
         """
         Combines Two chains into a new chain
         :param chain1: First chain to combine.
         :param chain2: Second chain to combine.
-        :param merge_type:
-        :param normalise:
-        :return: New merged Chain.
-        """
-        merged = cls()
-
-        # add all transitions from chain1
-        for u in chain1.states:
-            for v in chain1.successors(u):
-                merged.add_transition(u, v, chain1.transition_mass(u, v))
-
-        # add all transitions from chain2
-        for u in chain2.states:
-            for v in chain2.successors(u):
-                p2 = chain2.transition_mass(u, v)
-
-                if u not in merged._trans:
-                    merged.add_state(u)
-
-                if merge_type == "add":
-                    if v in merged.successors(u):
-                        # Only sum existing probability
-                        merged._trans[u][v]["p"] += p2
-                    else:
-                        merged.add_transition(u, v, p2)
-                else:  # overwrite
-                    merged.add_transition(u, v, p2)
+        :param merge_type: "add" sums the probabilities of shared transitions,
+            "overwrite" keeps those of chain2.
+        :param normalise: Rescale every row with outgoing mass to sum to 1.
+        :return: New merged Chain, states of chain1 first then the new states of chain2.
+        """
+        return cls.merge_many([chain1, chain2], merge_type, normalise)
+
+    @classmethod
+    def merge_many(
+        cls, chains: Iterable, merge_type: str = "add", normalise: bool = True
+    ):
+        """
+        Combines any number of chains into a new chain in a single aggregation.
+        :param chains: Chains to combine.
+        :param merge_type: "add" sums the probabilities of shared transitions,
+            "overwrite" keeps those of the last chain containing them.
+        :param normalise: Rescale every row with outgoing mass to sum to 1.
+        :return: New merged Chain, states in order of first appearance.
+        """
+        chains = list(chains)
+        states = list(dict.fromkeys(s for chain in chains for s in chain.states))
+        n = len(states)
+        union_idx = {s: i for i, s in enumerate(states)}
+
+        keys, probs = [np.zeros(0, dtype=np.int64)], [np.zeros(0)]
+        for chain in chains:
+            # Transitions of chain as linear row * n + col keys on the union index
+            rows, cols, p, _ = chain.to_coo()
+            remap = np.fromiter(
+                (union_idx[s] for s in chain.states), dtype=np.int64, count=len(chain)
+            )
+            keys.append(remap[rows] * n + remap[cols])
+            probs.append(p)
+
+        # Sorting the linear keys gives row major order
+        if merge_type == "add":
+            # Duplicates are summed
+            keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+            probs = np.bincount(
+                inverse.ravel(), weights=np.concatenate(probs), minlength=len(keys)
+            )
+        else:  # overwrite, the first occurrence is kept so later chains go first
+            keys, first = np.unique(np.concatenate(keys[::-1]), return_index=True)
+            probs = np.concatenate(probs[::-1])[first]
+
+        rows, cols = np.divmod(keys, n)
 
         if normalise:
-            for u in merged.states:
-                total = sum(merged.transition_mass(u, v) for v in merged.successors(u))
-                if total > 0:
-                    for v in merged.successors(u):
-                        merged._trans[u][v]["p"] /= total
+            totals = np.bincount(rows, weights=probs, minlength=n)
+            probs = probs / np.where(totals > 0, totals, 1.0)[rows]
 
-        return merged
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+        return cls.from_csr(indptr, cols, probs, states)
 
     def stationary_distribution(
-        self, method: str = "auto", tol: float = 1e-12, max_iter: int = 10000
-    ) -> set:
+        self,
+        method: str = "auto",
+        tol: float = 1e-12,
+        max_iter: int = 10000,
+        return_array: bool = False,
+    ) -> dict | Tuple[tuple, np.ndarray]:
         """
         Calculates the stationary distribution of the chain.
         :param method: "auto", "linear" or "power".
         :param tol: Optional Tolerance.
         :param max_iter: Optional max iterations of Power Method.
-        :return: set of stationary distribution.
+        :param return_array: If True, return (states, pi) with pi as an array.
+        :return: Dict of state to stationary probability, or (states, pi).
         """
-        n = len(self.states)
-        states = list(self.states)
-        P = np.array(self.to_adjacency_matrix(states, dense=True), dtype=float)
-
-        if method == "auto":
-            if n <= 20:
-                method = "linear"
-            else:
-                method = "power"
-
-        if method == "linear":
-            # Solve π P = π  <=> (P.T - I) π^T = 0, sum π_i = 1
-            A = P.T - np.eye(n)
-
-            A = np.vstack([A, np.ones(n)])
-            b = np.zeros(n + 1)
-            b[-1] = 1
-            try:
-                pi = np.linalg.lstsq(A, b, rcond=None)[0]
-                pi = np.clip(pi, 0, None)  # Remove negative small values
-                pi /= pi.sum()
-            except np.linalg.LinAlgError:
-                raise ValueError("Linear algebra soloutio nfailed, try method ='power'")
-
-        elif method == "power":
-
-            row_sums = P.sum(axis=1, keepdims=True)
-            row_sums[row_sums == 0] = 1
-            P = P / row_sums
-
-            pi = np.ones(n) / n
-            for _ in range(max_iter):
-                pi_next = pi @ P
-                if np.linalg.norm(pi_next - pi, 1) < tol:
-                    pi = pi_next
-                    break
-                pi = pi_next
-
-            pi /= pi.sum()
+        from .algorithms.analysis import stationary_distribution
 
-        return dict(zip(states, pi))
+        return stationary_distribution(
+            self, method=method, tol=tol, max_iter=max_iter, return_array=return_array
+        )
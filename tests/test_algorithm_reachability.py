@@ -1,10 +1,14 @@
+import numpy as np
 import pytest
 
 from markovpy import Chain
 from markovpy.algorithms.reachability import (
     reachable,
+    reachable_reverse,
+    reachability_matrix,
     communicates,
     communication_classes,
+    communication_class_of,
     is_closed,
 )
 
@@ -35,6 +39,35 @@ def test_reachable_does_not_traverse_against_direction():
     assert result == {"B"}
 
 
+def test_reachable_reverse_follows_predecessors():
+    """
+    reachable_reverse should return all states with a directed path to the source.
+    """
+    c = Chain()
+    c.add_transition("A", "B")
+    c.add_transition("B", "C")
+    c.add_transition("D", "B")
+
+    assert reachable_reverse(c, "C") == {"A", "B", "C", "D"}
+    assert reachable_reverse(c, "A") == {"A"}
+
+
+def test_reachability_matrix_matches_reachable():
+    """
+    Row i of reachability_matrix should mark exactly the states reachable from i.
+    """
+    c = Chain()
+    c.add_states_from(["A", "B", "C", "D", "E"])
+    c.add_transitions_from([("A", "B"), ("B", "C"), ("C", "A"), ("C", "D")])
+
+    R = reachability_matrix(c)
+    states = list(c.states)
+
+    assert R.shape == (5, 5)
+    for i, s in enumerate(states):
+        assert {t for j, t in enumerate(states) if R[i, j]} == reachable(c, s)
+
+
 def test_communicates_true_for_mutual_reachability():
     """
     Two states communicate if each is reachable from the other.
@@ -113,3 +146,130 @@ def test_readme_example():
     c.normalise()
 
     assert communication_classes(c) == [{"A"}, {"B"}, {"C"}]
+
+
+def test_communicates_updates_after_mutation():
+    """
+    Cached reachability must be invalidated when transitions are added.
+    """
+    c = Chain()
+    c.add_transition("A", "B")
+
+    assert not communicates(c, "A", "B")
+
+    c.add_transition("B", "A")
+
+    assert communicates(c, "A", "B")
+    assert communication_classes(c) == [{"A", "B"}]
+
+
+def test_communication_classes_long_cycle():
+    """
+    communication_classes should not be limited by recursion depth.
+    """
+    n = 5000
+    c = Chain()
+    for i in range(n):
+        c.add_transition(i, (i + 1) % n)
+    c.add_transition(n - 1, "sink")
+
+    assert communication_classes(c) == [set(range(n)), {"sink"}]
+
+
+def test_reachable_branching_chain():
+    """
+    reachable should follow every branch, including cycles back to the source.
+    """
+    c = Chain()
+    c.add_states_from(["X"])
+    c.add_transitions_from([("A", "B"), ("A", "C"), ("C", "D"), ("D", "A"), ("E", "A")])
+
+    assert reachable(c, "A") == {"A", "B", "C", "D"}
+    assert reachable(c, "E") == {"A", "B", "C", "D", "E"}
+    assert reachable(c, "X") == {"X"}
+
+
+def test_reachability_kernels_agree():
+    """
+    The bitset closure should match a CSR search from every source.
+    """
+    from markovpy.algorithms._kernels import closure_bitset, reachable_csr
+
+    c = Chain()
+    for i in range(100):
+        c.add_transition(i, (3 * i + 1) % 100)
+        c.add_transition(i, (i * i) % 70)
+
+    indptr, indices, _, _ = c.to_csr()
+    expected = [reachable_csr(indptr, indices, i).astype(bool) for i in range(100)]
+
+    assert (closure_bitset(indptr, indices) == np.array(expected)).all()
+
+
+def test_reach_mask_matches_csr_search():
+    """
+    The packed bitset search should agree with the CSR search from every state.
+    """
+    from markovpy.algorithms._kernels import reachable_csr, unpack_rows
+
+    c = Chain()
+    for i in range(130):
+        c.add_transition(i, (7 * i + 3) % 130)
+    c.add_state("isolated")
+
+    indptr, indices, _, _ = c.to_csr()
+    n = len(c)
+
+    for s, i in c._idx.items():
+        mask = unpack_rows(c.reach_mask(s)[None], n)[0]
+        assert (mask == reachable_csr(indptr, indices, i).astype(bool)).all()
+
+
+def test_reachable_switches_between_scalar_and_wide_levels():
+    """
+    A long path into a wide fan out and back into a path should be searched
+    the same by both kernels, whichever way each level is expanded.
+    """
+    from markovpy.algorithms._kernels import unpack_rows
+
+    c = Chain()
+    for i in range(300):
+        c.add_transition(("path", i), ("path", i + 1))
+    for j in range(200):
+        c.add_transition(("path", 300), ("fan", j))
+        c.add_transition(("fan", j), ("tail", 0))
+    for i in range(300):
+        c.add_transition(("tail", i), ("tail", i + 1))
+    c.add_state("isolated")
+
+    expected = set(c.states) - {"isolated"}
+    assert reachable(c, ("path", 0)) == expected
+    assert reachable_reverse(c, ("tail", 300)) == expected
+
+    # Once the CSR arrays are cached the same queries run on the kernels
+    c.to_csr()
+    c.to_csr(reverse=True)
+    assert reachable(c, ("path", 0)) == expected
+    assert reachable_reverse(c, ("tail", 300)) == expected
+
+    n = len(c)
+    mask = unpack_rows(c.reach_mask(("path", 0))[None], n)[0]
+    assert {s for s, i in c._idx.items() if mask[i]} == expected
+
+
+def test_communication_class_of_merges_incrementally():
+    """
+    communication_class_of should follow transitions added after the first query.
+    """
+    c = Chain()
+    c.add_transitions_from([("A", "B"), ("B", "C"), ("C", "D")])
+
+    assert communication_class_of(c, "B") == {"B"}
+
+    c.add_transition("C", "A")
+    assert communication_class_of(c, "B") == {"A", "B", "C"}
+    assert communication_class_of(c, "D") == {"D"}
+
+    c.add_transition("D", "E")
+    c.add_transition("E", "B")
+    assert communication_class_of(c, "E") == {"A", "B", "C", "D", "E"}
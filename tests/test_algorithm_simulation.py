@@ -1,3 +1,4 @@
+import random
 import pytest
 from markovpy import Chain
 from markovpy.algorithms.simulation import next_state, simulate, simulate_until
@@ -67,3 +68,47 @@ def test_simulate_until_invalid_steps():
 
     assert len(simulate_until(c, start="A", target="A")) == 1
     assert len(simulate_until(c, start="A", target="B")) >= 1
+
+
+def test_simulate_matches_next_state_under_seed():
+    matrix = [
+        [0.2, 0.3, 0.5],
+        [0.6, 0.0, 0.4],
+        [0.1, 0.1, 0.8],
+    ]
+    c = Chain.from_adjacency_matrix(matrix, states=["A", "B", "C"])
+
+    random.seed(1234)
+    traj = simulate(c, start="A", steps=200)
+
+    random.seed(1234)
+    expected = ["A"]
+    for _ in range(200):
+        expected.append(next_state(c, expected[-1]))
+
+    assert traj == expected
+
+
+def test_next_state_matches_simulate_after_mutation():
+    c = Chain(["A", "B", "C"])
+    c.add_transition("A", "B", p=0.5)
+    c.add_transition("A", "C", p=0.5)
+    c.add_transition("B", "C", p=1.0)
+    assert next_state(c, "B") == "C"
+
+    # Rows cached before the mutation must not leak into later draws
+    c.add_transition("C", "A", p=0.3)
+    c.add_transition("C", "B", p=0.7)
+    c.add_transition("B", "A", p=1.0)
+
+    random.seed(99)
+    expected = ["A"]
+    for _ in range(100):
+        expected.append(next_state(c, expected[-1]))
+
+    random.seed(99)
+    assert simulate(c, start="A", steps=100) == expected
+
+    # Once simulate has built the full rows next_state draws from them
+    random.seed(99)
+    assert [next_state(c, s) for s in expected[:-1]] == expected[1:]
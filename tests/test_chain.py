@@ -1,3 +1,6 @@
+import weakref
+
+import numpy as np
 import pytest
 
 from markovpy import Chain
@@ -33,7 +36,7 @@ def test_add_state_with_attributes():
 def test_add_states_from():
     c = Chain()
     c.add_states_from(["A", "B", "C"])
-    assert set(c.states) == {"A", "B", "C"}
+    assert sorted(c.states) == ["A", "B", "C"]
 
 
 def test_add_transition_adds_states():
@@ -127,6 +130,49 @@ def test_predecessors():
     assert set(c.predecessors("C")) == {"A", "B"}
 
 
+def test_predecessors_ignores_other_targets():
+    c = Chain()
+    c.add_transition("A", "B")
+    c.add_transition("A", "B", p=0.5)
+    c.add_transition("B", "C")
+
+    assert set(c.predecessors("B")) == {"A"}
+    assert set(c.predecessors("A")) == set()
+    assert c.in_degree("B") == 1
+    assert c.in_degree("A") == 0
+
+
+def test_predecessors_track_updated_probabilities():
+    c = Chain()
+    c.add_transition("A", "C", p=2.0)
+    c.add_transition("B", "C", p=2.0)
+    c.add_transition("B", "B", p=2.0)
+    c.add_transition("A", "C", p=6.0)
+    c.normalise()
+
+    assert list(c.predecessors("C")) == ["A", "B"]
+    assert c.in_degree("C", weight="p") == pytest.approx(1.5)
+    assert list(c.predecessors("missing")) == []
+
+
+def test_transition_mass_missing_transition():
+    c = Chain()
+    c.add_transition("A", "B", p=0.5)
+    c.add_state("C")
+
+    assert c.transition_mass("A", "B") == 0.5
+    assert c.transition_mass("A", "C") == 0.0
+    assert c.transition_mass("C", "A") == 0.0
+    assert c.transition_mass("missing", "A") == 0.0
+
+
+def test_transition_mass_without_probability():
+    c = Chain()
+    c.add_transition("A", "B")
+
+    assert c.transition_mass("A", "B") == 0.0
+
+
 def test_out_degree_unweighted():
     c = Chain()
     c.add_transition("A", "B")
@@ -143,6 +189,36 @@ def test_out_degree_weighted():
     assert c.out_degree("A", weight="p") == pytest.approx(1.0)
 
 
+def test_out_degree_weighted_tracks_mutation():
+    c = Chain()
+    c.add_transition("A", "B", p=0.4)
+    assert c.out_degree("A", weight="p") == pytest.approx(0.4)
+
+    c.add_transition("A", "B", p=0.1)
+    c.add_transition("A", "C", p=0.6)
+    c.add_transition("D", "A", p=1.0)
+
+    assert c.out_degree("A", weight="p") == pytest.approx(0.7)
+    assert c.out_degree("C", weight="p") == 0.0
+    assert c.out_degree("D", weight="p") == pytest.approx(1.0)
+
+    c.normalise()
+    assert c.out_degree("A", weight="p") == pytest.approx(1.0)
+
+
+def test_out_degree_weighted_does_not_drift():
+    c = Chain()
+    c.add_transition("A", "C", p=0.5)
+    c.out_degree("A", weight="p")
+    for i in range(1000):
+        c.add_transition("A", "B", p=0.1 * (i % 7))
+    c.add_transition("A", "B", p=0.0)
+
+    warm = c.out_degree("A", weight="p")
+    c.invalidate()
+    assert warm == c.out_degree("A", weight="p") == 0.5
+
+
 def test_in_degree_unweighted():
     c = Chain()
     c.add_transition("A", "C")
@@ -175,6 +251,20 @@ def test_is_stochastic_false():
     assert not c.is_stochastic()
 
 
+def test_is_stochastic_allows_absorbing_states():
+    c = Chain()
+    c.add_states_from(["A", "B", "C"])
+    c.add_transition("A", "C", p=1.0)
+    c.add_transition("C", "A", p=0.5)
+    c.add_transition("C", "C", p=0.5)
+
+    assert c.is_stochastic()
+
+    c.add_transition("B", "A", p=0.0)
+
+    assert not c.is_stochastic()
+
+
 def test_normalize():
     c = Chain()
     c.add_transition("A", "B", p=2.0)
@@ -187,6 +277,37 @@ def test_normalize():
     assert c.is_stochastic()
 
 
+def test_normalize_skips_empty_rows():
+    c = Chain()
+    c.add_states_from(["A", "B", "C"])
+    c.add_transition("A", "C", p=3.0)
+    c.add_transition("C", "A", p=1.0)
+    c.add_transition("C", "C", p=4.0)
+
+    c.normalise()
+
+    assert c.transition_mass("A", "C") == pytest.approx(1.0)
+    assert c.transition_mass("C", "A") == pytest.approx(0.2)
+    assert c.transition_mass("C", "C") == pytest.approx(0.8)
+    assert list(c.successors("B")) == []
+
+
+def test_normalize_with_cached_csr():
+    c = Chain()
+    c.add_states_from(["A", "B", "C"])
+    c.add_transition("A", "C", p=3.0)
+    c.add_transition("C", "A", p=1.0)
+    c.add_transition("C", "C", p=4.0)
+    c.to_csr()
+
+    c.normalise()
+
+    assert c.transition_mass("C", "A") == pytest.approx(0.2)
+    assert c.transition_mass("C", "C") == pytest.approx(0.8)
+    np.testing.assert_allclose(c.to_csr()[2], [1.0, 0.2, 0.8])
+    assert c.is_stochastic()
+
+
 def test_len_iter_contains():
     c = Chain()
     c.add_states_from(["A", "B"])
@@ -203,3 +324,196 @@ def test_repr():
 
     assert "states" in r
     assert "transitions" in r
+
+
+def test_to_csr():
+    c = Chain()
+    c.add_states_from(["A", "B", "C"])
+    c.add_transition("A", "C", p=0.75)
+    c.add_transition("A", "B", p=0.25)
+    c.add_transition("C", "C")
+
+    indptr, indices, probs, state_to_idx = c.to_csr()
+
+    assert state_to_idx == {"A": 0, "B": 1, "C": 2}
+    assert indptr.tolist() == [0, 2, 2, 3]
+    assert indices.tolist() == [1, 2, 2]
+    assert probs.tolist() == [0.25, 0.75, 0.0]
+
+
+def test_to_coo():
+    c = Chain()
+    c.add_states_from(["A", "B", "C"])
+    c.add_transition("A", "C", p=0.75)
+    c.add_transition("A", "B", p=0.25)
+    c.add_transition("C", "C")
+
+    rows, cols, probs, _ = c.to_coo()
+
+    assert rows.tolist() == [0, 0, 2]
+    assert cols.tolist() == [1, 2, 2]
+    assert probs.tolist() == [0.25, 0.75, 0.0]
+    assert not rows.flags.writeable
+
+
+def test_to_csr_invalidated_by_mutation():
+    c = Chain()
+    c.add_transition("A", "B", p=1.0)
+
+    assert c.to_csr() is c.to_csr()
+
+    c.add_transition("B", "A", p=1.0)
+    indptr, indices, _, _ = c.to_csr()
+
+    assert indptr.tolist() == [0, 1, 2]
+    assert indices.tolist() == [1, 0]
+
+
+def test_add_transitions_bulk():
+    c = Chain()
+    c.add_transition("A", "A", p=1.0)
+    c.add_transitions_bulk(
+        ["A", "A", "B"], ["B", "C", "C"], np.array([0.25, 0.75, 1.0])
+    )
+
+    assert list(c.states) == ["A", "B", "C"]
+    assert c.transition_mass("A", "B") == 0.25
+    assert c.transition_mass("A", "A") == 1.0
+    assert set(c.predecessors("C")) == {"A", "B"}
+    assert type(c.transition_mass("B", "C")) is float
+
+
+def test_add_transitions_bulk_length_mismatch():
+    c = Chain()
+    with pytest.raises(ValueError):
+        c.add_transitions_bulk(["A", "B"], ["B"])
+
+
+def test_from_csr_round_trip():
+    c = Chain()
+    c.add_transitions_from([("X", "Y", 0.5), ("X", "X", 0.5), ("Y", "X", 1.0)])
+
+    indptr, indices, probs, _ = c.to_csr()
+    rebuilt = Chain.from_csr(indptr, indices, probs, states=list(c.states))
+
+    np.testing.assert_array_equal(
+        rebuilt.to_adjacency_matrix(), c.to_adjacency_matrix()
+    )
+    assert list(rebuilt.states) == ["X", "Y"]
+
+
+def test_from_csr_unsorted_columns():
+    # Row 0 lists column 1 before column 0, to_csr must still sort them
+    rebuilt = Chain.from_csr([0, 2, 3], [1, 0, 0], [0.3, 0.7, 1.0])
+
+    indptr, indices, probs, _ = rebuilt.to_csr()
+
+    assert indices.tolist() == [0, 1, 0]
+    assert probs.tolist() == [0.7, 0.3, 1.0]
+
+
+@pytest.mark.parametrize(
+    "indptr, indices",
+    [
+        ([0, 1, 1], [-1]),
+        ([0, 1, 1], [2]),
+        ([0, 2, 1], [0]),
+        ([1, 2, 2], [0, 1]),
+    ],
+)
+def test_from_csr_rejects_inconsistent_arrays(indptr, indices):
+    with pytest.raises(ValueError, match="Inconsistent CSR arrays"):
+        Chain.from_csr(indptr, indices, [1.0] * len(indices), states=["A", "B"])
+
+
+@pytest.mark.parametrize("indices", [[0, 1, 0], [1, 0, 0]])
+def test_from_csr_cache_matches_rebuild(indices):
+    c = Chain.from_csr([0, 2, 3], indices, [0.3, 0.7, 1.0], states=["A", "B"])
+
+    adopted = [arr.tolist() for arr in c.to_csr()[:3]]
+    c.invalidate()
+    assert [arr.tolist() for arr in c.to_csr()[:3]] == adopted
+
+
+def test_from_csr_bad_index_is_not_cached():
+    # [-1] used to build A -> B while caching the column as -1
+    with pytest.raises(ValueError):
+        Chain.from_csr([0, 1, 1], [-1], [1.0], states=["A", "B"])
+    with pytest.raises(ValueError):
+        Chain.from_csr([0, 2, 3], [-1, 0, 0], [0.3, 0.7, 1.0], states=["A", "B"])
+
+
+def test_cdf_rows():
+    c = Chain()
+    c.add_transition("A", "B", p=0.25)
+    c.add_transition("A", "A", p=0.75)
+    c.add_transition("B", "A", p=1.0)
+    c.add_state("C")
+
+    successors, cdfs = c.cdf_rows()
+
+    assert successors == [[1, 0], [0], []]
+    assert cdfs == [[0.25, 1.0], [1.0], []]
+
+
+def test_state_list_follows_insertion_order():
+    c = Chain(["B"])
+    c.add_transition("A", "B", 1.0)
+    c.add_transitions_bulk(["C"], ["D"], [1.0])
+
+    assert c._state_list == list(c.states) == ["B", "A", "C", "D"]
+    assert [c._idx[s] for s in c._state_list] == [0, 1, 2, 3]
+
+
+def test_is_stochastic_spans_row_blocks():
+    n = 5000
+    c = Chain()
+    c.add_transitions_bulk(range(n), [(i + 1) % n for i in range(n)], [1.0] * n)
+    c.to_csr()  # the blocks run over a cached CSR only
+    assert c.is_stochastic()
+
+    c.add_transition(n - 1, 0, 0.5)
+    assert not c.is_stochastic()
+    c.to_csr()
+    assert not c.is_stochastic()
+
+
+def test_transitions():
+    c = Chain()
+    c.add_transitions_from([("A", "B", 0.4), ("A", "C", 0.6), ("C", "A", 1.0)])
+
+    assert [(u, v, attr["p"]) for u, v, attr in c.transitions()] == [
+        ("A", "B", 0.4),
+        ("A", "C", 0.6),
+        ("C", "A", 1.0),
+    ]
+    assert [v for _, v, _ in c.transitions("A")] == ["B", "C"]
+    assert list(c.transitions("missing")) == []
+
+
+def test_invalidate_after_in_place_edit():
+    c = Chain()
+    c.add_transitions_from([("A", "B", 0.5), ("A", "C", 0.5), ("B", "A", 1.0)])
+    c.add_transition("C", "A", 1.0)
+    assert c.is_stochastic()
+    assert c.out_degree("A", "p") == 1.0
+
+    for _, _, attr in c.transitions("A"):
+        attr["p"] = 0.25
+
+    # The caches only see the edit once invalidated
+    c.invalidate()
+    assert not c.is_stochastic()
+    assert c.out_degree("A", "p") == 0.5
+    assert c.to_adjacency_matrix()[0][1] == 0.25
+
+
+def test_chain_supports_weak_references():
+    c = Chain()
+    assert weakref.ref(c)() is c
+
+
+def test_chain_accepts_new_attributes():
+    c = Chain()
+    c.label = "weather"
+    assert c.label == "weather"
@@ -1,4 +1,6 @@
+import warnings
 import pytest
+import numpy as np
 from markovpy.chain import Chain
 
 
@@ -98,3 +100,44 @@ def test_state_length_mismatch_raises():
 
     with pytest.raises(ValueError):
         Chain.from_adjacency_matrix(matrix, states=["only_one"])
+
+
+def test_from_adjacency_matrix_keeps_state_order():
+    matrix = [
+        [0, 0, 1],
+        [1, 0, 0],
+        [0, 1, 0],
+    ]
+
+    chain = Chain.from_adjacency_matrix(matrix, states=["A", "B", "C"])
+
+    assert list(chain.states) == ["A", "B", "C"]
+    np.testing.assert_array_equal(chain.to_adjacency_matrix(), matrix)
+
+
+def test_from_adjacency_matrix_ndarray():
+    matrix = np.array([[0.25, 0.75], [1.0, 0.0]])
+
+    chain = Chain.from_adjacency_matrix(matrix, states=["A", "B"])
+
+    assert chain.transition_mass("A", "B") == pytest.approx(0.75)
+    assert list(chain.successors("B")) == ["A"]
+
+    with pytest.raises(ValueError):
+        Chain.from_adjacency_matrix(np.ones((2, 3)))
+
+
+def test_ragged_matrix_raises():
+    with pytest.raises(ValueError, match="square"):
+        Chain.from_adjacency_matrix([[1, 0], [1]])
+
+
+def test_from_adjacency_matrix_zero_row_without_validation():
+    matrix = [[0, 0], [2, 2]]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        chain = Chain.from_adjacency_matrix(matrix, states=["A", "B"], validate=False)
+
+    assert list(chain.successors("A")) == []
+    np.testing.assert_array_equal(chain.to_adjacency_matrix(), [[0, 0], [0.5, 0.5]])
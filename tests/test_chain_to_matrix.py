@@ -1,4 +1,4 @@
-import pytest
+import numpy as np
 from markovpy.chain import Chain
 
 
@@ -6,7 +6,19 @@ def test_matrix_round_trip():
     matrix = [[0.1, 0.9], [0.6, 0.4]]
     chain = Chain.from_adjacency_matrix(matrix)
     round_trip = chain.to_adjacency_matrix()
-    assert round_trip == matrix
+    assert isinstance(round_trip, np.ndarray)
+    np.testing.assert_array_equal(round_trip, matrix)
+
+
+def test_to_adjacency_matrix_as_list():
+    matrix = [[0.1, 0.9], [0.6, 0.4]]
+    chain = Chain.from_adjacency_matrix(matrix, states=["A", "B"])
+
+    assert chain.to_adjacency_matrix(as_list=True) == matrix
+    assert chain.to_adjacency_matrix(states=["B", "A"], as_list=True) == [
+        [0.4, 0.6],
+        [0.9, 0.1],
+    ]
 
 
 def test_to_adjacency_matrix_dense():
@@ -18,14 +30,10 @@ def test_to_adjacency_matrix_dense():
 
     dense = chain.to_adjacency_matrix()
     # Check shape
-    assert len(dense) == 2
-    assert all(len(row) == 2 for row in dense)
+    assert np.shape(dense) == (2, 2)
 
     # Check values
-    assert dense[0][0] == pytest.approx(0.2)
-    assert dense[0][1] == pytest.approx(0.8)
-    assert dense[1][0] == pytest.approx(0.5)
-    assert dense[1][1] == pytest.approx(0.5)
+    np.testing.assert_allclose(dense, matrix, rtol=1e-12)
 
 
 def test_to_adjacency_matrix_sparse():
@@ -42,6 +50,28 @@ def test_to_adjacency_matrix_sparse():
     assert sparse[1] == {0: 1.0}
 
 
+def test_to_adjacency_matrix_sparse_arrays():
+    matrix = [
+        [0.0, 1.0, 0.0],
+        [0.5, 0.0, 0.5],
+        [0.0, 1.0, 0.0],
+    ]
+    chain = Chain.from_adjacency_matrix(matrix, states=["A", "B", "C"])
+
+    indptr, indices, probs = chain.to_adjacency_matrix(dense=False, as_dict=False)
+    assert indptr.tolist() == [0, 1, 3, 4]
+    assert indices.tolist() == [1, 0, 2, 1]
+    np.testing.assert_array_equal(probs, [1.0, 0.5, 0.5, 1.0])
+
+    # Reordered and restricted to B, A
+    indptr, indices, probs = chain.to_adjacency_matrix(
+        states=["B", "A"], dense=False, as_dict=False
+    )
+    assert indptr.tolist() == [0, 1, 2]
+    assert indices.tolist() == [1, 0]
+    np.testing.assert_array_equal(probs, [0.5, 1.0])
+
+
 def test_to_adjacency_matrix_custom_order():
     matrix = [
         [0.0, 1.0],
@@ -51,9 +81,29 @@ def test_to_adjacency_matrix_custom_order():
     chain = Chain.from_adjacency_matrix(matrix, states=states)
 
     dense_custom = chain.to_adjacency_matrix(states=["B", "A"])
-    # Row 0 = B
-    assert dense_custom[0][0] == pytest.approx(0.0)  # B→B
-    assert dense_custom[0][1] == pytest.approx(1.0)  # B→A
-    # Row 1 = A
-    assert dense_custom[1][0] == pytest.approx(1.0)  # A→B
-    assert dense_custom[1][1] == pytest.approx(0.0)  # A→A
+    # Row 0 = B, row 1 = A
+    np.testing.assert_allclose(dense_custom, [[0.0, 1.0], [1.0, 0.0]], rtol=1e-12)
+
+
+def test_to_adjacency_matrix_reflects_mutation():
+    chain = Chain.from_adjacency_matrix([[0.0, 1.0], [1.0, 0.0]])
+    np.testing.assert_array_equal(chain.to_adjacency_matrix(), [[0, 1], [1, 0]])
+
+    chain.add_transition(0, 0, p=0.5)
+    chain.add_transition(0, 1, p=0.5)
+
+    np.testing.assert_array_equal(chain.to_adjacency_matrix(), [[0.5, 0.5], [1, 0]])
+
+
+def test_to_adjacency_matrix_cached_per_order():
+    chain = Chain.from_adjacency_matrix([[0.0, 1.0], [1.0, 0.0]], states=["A", "B"])
+
+    reordered = chain.to_adjacency_matrix(states=["B", "A"])
+    assert chain.to_adjacency_matrix(states=["B", "A"]) is reordered
+    assert chain.to_adjacency_matrix(states=["A", "B"]) is chain.to_adjacency_matrix()
+    assert not reordered.flags.writeable
+
+    chain.add_transition("B", "B", p=1.0)
+    np.testing.assert_array_equal(
+        chain.to_adjacency_matrix(states=["B", "A"]), [[1.0, 1.0], [1.0, 0.0]]
+    )
@@ -3,19 +3,29 @@ import markovpy as mp
 import pytest
 from markovpy.algorithms import expected_hitting_times
 
-
-def test_target_state_zero():
-    P = [
-        [1.0, 0.0],
-        [0.5, 0.5],
-    ]
-    states = ["A", "B"]
+# (P, target) pairs where target is reachable from every state
+HITTING_CASES = [
+    ([[1.0, 0.0], [0.5, 0.5]], 0),
+    ([[0.0, 1.0], [0.2, 0.8]], 1),
+    ([[0.2, 0.5, 0.3], [0.1, 0.6, 0.3], [0.0, 0.0, 1.0]], 2),
+]
+
+
+@pytest.fixture(scope="module", params=HITTING_CASES)
+def chain_target(request):
+    P, target = request.param
+    states = ["A", "B", "C"][: len(P)]
     chain = mp.Chain.from_adjacency_matrix(P, states)
     chain.normalise()
+    return chain, target
+
+
+def test_target_state_zero(chain_target):
+    chain, target = chain_target
 
-    h = expected_hitting_times(chain, target=0)
+    h = expected_hitting_times(chain, target=target)
 
-    assert h[0] == 0.0
+    assert h[target] == 0.0
 
 
 def test_two_state_absorbing():
@@ -48,21 +58,13 @@ def test_geometric_waiting_time():
     assert h[1] == 0.0
 
 
-def test_first_step_equation():
-    P = [
-        [0.2, 0.5, 0.3],
-        [0.1, 0.6, 0.3],
-        [0.0, 0.0, 1.0],
-    ]
-    states = ["A", "B", "C"]
-    chain = mp.Chain.from_adjacency_matrix(P, states)
-    chain.normalise()
+def test_first_step_equation(chain_target):
+    chain, target = chain_target
 
-    target = 2
     h = expected_hitting_times(chain, target)
     P_np = np.asarray(chain.to_adjacency_matrix())
 
-    for i in range(len(states)):
+    for i in range(len(chain)):
         if i == target:
             assert h[i] == 0.0
         else:
@@ -70,29 +72,17 @@ def test_first_step_equation():
             assert np.isclose(h[i], rhs)
 
 
-def test_key_and_index_target_equivalence():
-    P = [
-        [0.0, 1.0],
-        [0.2, 0.8],
-    ]
-    states = ["A", "B"]
-    chain = mp.Chain.from_adjacency_matrix(P, states)
-    chain.normalise()
+def test_key_and_index_target_equivalence(chain_target):
+    chain, target = chain_target
 
-    h_idx = expected_hitting_times(chain, target=1)
-    h_key = expected_hitting_times(chain, target="B")
+    h_idx = expected_hitting_times(chain, target=target)
+    h_key = expected_hitting_times(chain, target=list(chain.states)[target])
 
     assert np.allclose(h_idx, h_key)
 
 
-def test_invalid_target_key():
-    P = [
-        [0.5, 0.5],
-        [0.5, 0.5],
-    ]
-    states = ["A", "B"]
-    chain = mp.Chain.from_adjacency_matrix(P, states)
-    chain.normalise()
+def test_invalid_target_key(chain_target):
+    chain, _ = chain_target
 
     with pytest.raises(KeyError):
-        expected_hitting_times(chain, target="C")
+        expected_hitting_times(chain, target="D")
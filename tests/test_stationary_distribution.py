@@ -1,41 +1,149 @@
 import markovpy as mp
 from markovpy.algorithms import stationary_distribution
 import numpy as np
+import pytest
 
 
-def test_stationary_linear():
-    matrix = [[0.9, 0.1], [0.5, 0.5]]
-    chain = mp.Chain.from_adjacency_matrix(matrix)
-    pi = stationary_distribution(chain, method="linear")
+def _vec(d, keys):
+    """Values of d at keys as a float array, without an intermediate list."""
+    return np.fromiter(map(d.__getitem__, keys), dtype=np.float64, count=len(keys))
+
+
+@pytest.fixture(scope="module")
+def two_state_chain():
+    return mp.Chain.from_adjacency_matrix([[0.9, 0.1], [0.5, 0.5]])
+
+
+@pytest.fixture(scope="module")
+def sticky_chain():
+    return mp.Chain.from_adjacency_matrix([[0.5, 0.5], [0.2, 0.8]])
+
+
+# The free function and the Chain method should be interchangeable
+SOLVERS = pytest.mark.parametrize(
+    "solver",
+    [
+        lambda chain, **kw: stationary_distribution(chain, return_array=True, **kw),
+        lambda chain, **kw: chain.stationary_distribution(return_array=True, **kw),
+    ],
+    ids=["function", "method"],
+)
+
+
+def _check(chain, states, pi_vec, rtol):
+    """Asserts pi is a distribution in chain order with pi P ≈ pi."""
+    assert states == tuple(chain.states)
 
     # Check that sum is 1
-    assert abs(sum(pi.values()) - 1.0) < 1e-12
+    assert abs(pi_vec.sum() - 1.0) < 1e-12
 
     # Check stationary property: pi P ≈ pi
-    states = list(chain.states)
     P = np.array(chain.to_adjacency_matrix(states=states, dense=True))
-    pi_vec = np.array([pi[s] for s in states])
-    np.testing.assert_allclose(pi_vec @ P, pi_vec, rtol=1e-12)
+    np.testing.assert_allclose(pi_vec @ P, pi_vec, rtol=rtol, atol=0)
+
 
+@SOLVERS
+def test_stationary_linear(two_state_chain, solver):
+    states, pi_vec = solver(two_state_chain, method="linear")
 
-def test_stationary_power():
+    _check(two_state_chain, states, pi_vec, rtol=1e-12)
 
-    matrix = [[0.5, 0.5], [0.2, 0.8]]
-    chain = mp.Chain.from_adjacency_matrix(matrix)
 
+@SOLVERS
+def test_stationary_power(sticky_chain, solver):
     # Use power method with reasonable tol and max_iter
-    pi = stationary_distribution(chain, method="power", tol=1e-12, max_iter=100000)
+    states, pi_vec = solver(sticky_chain, method="power", tol=1e-12, max_iter=100000)
+
+    _check(sticky_chain, states, pi_vec, rtol=1e-10)
+
+    # Compare with linear solution
+    _, pi_linear_vec = solver(sticky_chain, method="linear")
+    np.testing.assert_allclose(pi_vec, pi_linear_vec, rtol=1e-10, atol=0)
+
+
+def test_stationary_power_without_transitions():
+    # Every state is absorbing, the uniform start is already stationary
+    pi = stationary_distribution(mp.Chain(["a", "b"]), method="power")
+    assert pi == pytest.approx({"a": 0.5, "b": 0.5})
+
+
+def test_stationary_power_keeps_absorbed_mass():
+    dense = mp.Chain(["a", "b"])
+    dense.add_transition("a", "b", p=1.0)
+    assert stationary_distribution(dense, method="power") == pytest.approx(
+        {"a": 0.0, "b": 1.0}
+    )
 
-    # 1. Probabilities sum to 1
-    assert abs(sum(pi.values()) - 1.0) < 1e-12
+    sparse = mp.Chain("abcde")
+    sparse.add_transition("a", "b", p=1.0)
+    assert stationary_distribution(sparse, method="power") == pytest.approx(
+        {"a": 0.0, "b": 0.4, "c": 0.2, "d": 0.2, "e": 0.2}
+    )
+
+
+def test_stationary_linear_reducible():
+    # Transient A feeds two closed classes {B} and {C, D}
+    chain = mp.Chain.from_adjacency_matrix(
+        [[0.2, 0.4, 0.4, 0.0], [0, 1, 0, 0], [0, 0, 0.5, 0.5], [0, 0, 1, 0]],
+        states="ABCD",
+    )
+    pi = stationary_distribution(chain, method="linear")
 
-    # 2. Stationarity: π P ≈ π
     states = list(chain.states)
-    P = np.array(chain.to_adjacency_matrix(states=states, dense=True))
-    pi_vec = np.array([pi[s] for s in states])
-    np.testing.assert_allclose(pi_vec @ P, pi_vec, rtol=1e-10, atol=0)
+    P = np.asarray(chain.to_adjacency_matrix())
+    pi_vec = _vec(pi, states)
+    assert pi_vec.min() >= 0
+    np.testing.assert_allclose(pi_vec.sum(), 1.0, rtol=1e-12)
+    np.testing.assert_allclose(pi_vec @ P, pi_vec, atol=1e-12)
+    assert pi["A"] == 0.0
 
-    # 3. Optional: compare with linear solution
-    pi_linear = chain.stationary_distribution(method="linear")
-    pi_linear_vec = np.array([pi_linear[s] for s in states])
-    np.testing.assert_allclose(pi_vec, pi_linear_vec, rtol=1e-10, atol=0)
+
+def test_power_kernels_agree():
+    """
+    The dense and CSR power iterations should converge to the same iterate.
+    """
+    from markovpy.algorithms._kernels import power_iteration_csr, power_iteration_dense
+
+    rng = np.random.default_rng(0)
+    P = rng.random((30, 30)) * (rng.random((30, 30)) < 0.5) + 0.01 * np.eye(30)
+    P /= P.sum(axis=1, keepdims=True)
+
+    indptr, indices, probs, _ = mp.Chain.from_adjacency_matrix(P).to_csr()
+
+    np.testing.assert_allclose(
+        power_iteration_dense(P, 1e-14, 10000),
+        power_iteration_csr(indptr, indices, probs, 1e-14, 10000),
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("max_iter", [1, 50, 257, 1000])
+def test_power_dense_takes_exactly_max_iter_steps(max_iter):
+    """
+    Without convergence the squared steps should add up to exactly max_iter,
+    the iterate then equals the start vector times P ** max_iter.
+    """
+    from markovpy.algorithms._kernels import power_iteration_dense
+
+    P = np.array([[0.999, 0.001], [0.002, 0.998]])
+    expected = np.full(2, 0.5) @ np.linalg.matrix_power(P, max_iter)
+
+    np.testing.assert_allclose(
+        power_iteration_dense(P, 0.0, max_iter), expected, rtol=1e-12
+    )
+
+
+def test_stationary_power_slow_mixing():
+    # Two blocks coupled with probability ~1e-7, plain iteration would need ~1e8 steps
+    rng = np.random.default_rng(1)
+    P = rng.random((20, 20))
+    P[:10, 10:] *= 1e-7
+    P[10:, :10] *= 1e-7
+    chain = mp.Chain.from_adjacency_matrix(P)
+
+    pi = stationary_distribution(chain, method="power", tol=1e-13, max_iter=10**9)
+    pi_linear = stationary_distribution(chain, method="linear")
+
+    np.testing.assert_allclose(
+        _vec(pi, chain.states), _vec(pi_linear, chain.states), rtol=1e-6, atol=1e-12
+    )